@@ -0,0 +1,188 @@
+"""
+Shared camera model for the calib-camera/cam_*/camera_calib_real.json files.
+
+Each calibration file is read once (load_camera is memoised) and the derived
+matrices and undistortion maps are computed lazily and kept on the
+CameraModel. All point APIs take and return (N,2) / (N,3) arrays so they can
+be used on millions of points at a time.
+"""
+import os
+import json
+import hashlib
+from functools import lru_cache, cached_property
+
+import cv2
+import numpy as np
+
+# Bump when the undistort_map computation changes so older .npz caches are
+# not picked up (2: float64 iterative undistortPoints, 40 iterations).
+UNDISTORT_MAP_VERSION = 2
+
+
+class CameraModel:
+    def __init__(self, calib_path):
+        self.path = calib_path
+        with open(calib_path, 'rb') as f:
+            raw = f.read()
+        self._calib = json.loads(raw)
+        self.digest = hashlib.sha1(raw).hexdigest()
+        self._maps = {}
+
+    # ── intrinsics / extrinsics ─────────────────────────────────────────
+    @cached_property
+    def K(self):
+        return np.array(self._calib["mtx"], dtype=np.float64).reshape(3, 3)
+
+    @cached_property
+    def K_inv(self):
+        return np.linalg.inv(self.K)
+
+    @cached_property
+    def dist(self):
+        # OpenCV order: k1, k2, p1, p2, k3
+        return np.array(self._calib["dist"], dtype=np.float64).ravel()
+
+    @cached_property
+    def R(self):
+        R, _ = cv2.Rodrigues(np.array(self._calib.get("rvecs", [0, 0, 0]), dtype=np.float64).reshape(3, 1))
+        return R
+
+    @cached_property
+    def t(self):
+        return np.array(self._calib.get("tvecs", [0, 0, 0]), dtype=np.float64).reshape(3)
+
+    @cached_property
+    def P(self):
+        """3×4 projection matrix K [R | t]."""
+        return self.K @ np.hstack((self.R, self.t.reshape(3, 1)))
+
+    @cached_property
+    def center(self):
+        """Camera centre in world coordinates, C = -Rᵀt."""
+        return -self.R.T @ self.t
+
+    # ── undistortion maps ───────────────────────────────────────────────
+    def undistort_map(self, width, height, cache=True):
+        """
+        Per-pixel map used by rectified_videos.py: entry (y, x) is where the
+        distorted pixel (x, y) lands after undistortion (P = K). Building it
+        for a 4K frame takes seconds, so it is also cached as .npz next to
+        the calibration file, keyed by the calibration's content and
+        UNDISTORT_MAP_VERSION so an edited calibration or a changed method
+        never reuses a stale map.
+        """
+        key = ("undistort", width, height)
+        if key in self._maps:
+            return self._maps[key]
+
+        tag = hashlib.sha1(f"{self.digest}|v{UNDISTORT_MAP_VERSION}".encode()).hexdigest()[:12]
+        cache_path = os.path.join(os.path.dirname(self.path), f"undistort_map_{width}x{height}_{tag}.npz")
+        if cache and os.path.exists(cache_path):
+            cached = np.load(cache_path)
+            if cached["map_x"].shape == (height, width):
+                self._maps[key] = (cached["map_x"], cached["map_y"])
+                return self._maps[key]
+
+        grid_x, grid_y = np.meshgrid(np.arange(width), np.arange(height))
+        pts = np.stack([grid_x, grid_y], axis=-1).reshape(-1, 2)
+        undistorted_map = self.undistort_points(pts, P=self.K).astype(np.float32).reshape(height, width, 2)
+        map_x = np.ascontiguousarray(undistorted_map[:, :, 0])
+        map_y = np.ascontiguousarray(undistorted_map[:, :, 1])
+
+        if cache:
+            np.savez(cache_path, map_x=map_x, map_y=map_y)
+        self._maps[key] = (map_x, map_y)
+        return map_x, map_y
+
+    def rectify_maps(self, width, height, alpha=0):
+        """
+        cv2.initUndistortRectifyMap maps onto the optimal new camera matrix
+        for `alpha` (as used by utils/convert_to_rectified_track.py).
+        """
+        key = ("rectify", width, height, alpha)
+        if key not in self._maps:
+            newK, _ = cv2.getOptimalNewCameraMatrix(self.K, self.dist, (width, height), alpha)
+            self._maps[key] = cv2.initUndistortRectifyMap(
+                self.K, self.dist, None, newK, (width, height), cv2.CV_32FC1)
+        return self._maps[key]
+
+    # ── batched point APIs ──────────────────────────────────────────────
+    def distort_normalized(self, xy):
+        """Apply the radial/tangential distortion to normalised image coords (N,2)."""
+        k1, k2, p1, p2, k3 = np.pad(self.dist, (0, max(0, 5 - len(self.dist))))[:5]
+        x, y = xy[:, 0], xy[:, 1]
+        r2 = x * x + y * y
+        radial = 1 + r2 * (k1 + r2 * (k2 + r2 * k3))
+        xd = x * radial + 2 * p1 * x * y + p2 * (r2 + 2 * x * x)
+        yd = y * radial + p1 * (r2 + 2 * y * y) + 2 * p2 * x * y
+        return np.column_stack([xd, yd])
+
+    def project(self, X, distort=True):
+        """World points (N,3) -> pixel coords (N,2)."""
+        Xc = np.asarray(X, dtype=np.float64).reshape(-1, 3) @ self.R.T + self.t
+        xy = Xc[:, :2] / Xc[:, 2:3]
+        if distort:
+            xy = self.distort_normalized(xy)
+        return xy @ self.K[:2, :2].T + self.K[:2, 2]
+
+    def undistort_points(self, uv, P=None):
+        """
+        Distorted pixels (N,2) -> undistorted points (N,2): normalised
+        coordinates by default, or pixels of projection matrix P (e.g. K).
+        """
+        uv = np.asarray(uv, dtype=np.float64).reshape(-1, 1, 2)
+        # more iterations than cv2.undistortPoints' default 5; the lenses here
+        # have strong k3 terms towards the image corners
+        criteria = (cv2.TERM_CRITERIA_COUNT | cv2.TERM_CRITERIA_EPS, 40, 1e-10)
+        if hasattr(cv2, "undistortPointsIter"):   # OpenCV 4.x
+            out = cv2.undistortPointsIter(uv, self.K, self.dist, None, P, criteria)
+        else:                                     # OpenCV 5 takes criteria directly
+            out = cv2.undistortPoints(uv, self.K, self.dist, R=None, P=P, criteria=criteria)
+        return out.reshape(-1, 2)
+
+    def back_project(self, uv, undistort=True):
+        """
+        Pixels (N,2) -> viewing rays. Returns (origin (3,), unit directions
+        (N,3)) in world coordinates.
+        """
+        if undistort:
+            xy = self.undistort_points(uv)
+        else:
+            uv = np.asarray(uv, dtype=np.float64).reshape(-1, 2)
+            xy = uv @ self.K_inv[:2, :2].T + self.K_inv[:2, 2]
+        d = np.column_stack([xy, np.ones(len(xy))]) @ self.R   # Rᵀ d, row-wise
+        return self.center, d / np.linalg.norm(d, axis=1, keepdims=True)
+
+    def reprojection_error(self, X, uv, distort=True):
+        """Per-point pixel distance between project(X) and observed uv."""
+        return np.linalg.norm(self.project(X, distort) - np.asarray(uv, dtype=np.float64).reshape(-1, 2), axis=1)
+
+    def fundamental(self, other):
+        """Fundamental matrix F with x_otherᵀ F x_self = 0 (undistorted pixels)."""
+        R_rel = other.R @ self.R.T
+        t_rel = other.t - R_rel @ self.t
+        tx = np.array([[0, -t_rel[2], t_rel[1]],
+                       [t_rel[2], 0, -t_rel[0]],
+                       [-t_rel[1], t_rel[0], 0]])
+        return other.K_inv.T @ tx @ R_rel @ self.K_inv
+
+    def epipolar_lines(self, uv, other, undistort=True):
+        """
+        Pixels (N,2) in this camera -> epipolar lines (N,3) [a,b,c] in
+        `other`'s undistorted image, normalised so a² + b² = 1.
+        """
+        if undistort:
+            uv = self.undistort_points(uv, P=self.K)
+        uv = np.asarray(uv, dtype=np.float64).reshape(-1, 2)
+        lines = np.column_stack([uv, np.ones(len(uv))]) @ self.fundamental(other).T
+        return lines / np.linalg.norm(lines[:, :2], axis=1, keepdims=True)
+
+
+@lru_cache(maxsize=None)
+def _load_camera(abs_path):
+    return CameraModel(abs_path)
+
+
+def load_camera(calib_path):
+    """Memoised CameraModel for a calibration JSON."""
+    return _load_camera(os.path.abspath(calib_path))
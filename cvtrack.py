@@ -0,0 +1,133 @@
+#!/usr/bin/env python3
+"""
+cvtrack – one entry point for the whole pipeline.
+
+  python cvtrack.py track-csv --video videos_rectified/out2.mp4 --out_csv runs/detect/cam_2/tracks_cam2.csv
+  python cvtrack.py --config cvtrack.yaml triangulate
+  python cvtrack.py --config cvtrack.yaml batch [--dry_run]
+
+Every subcommand is a script of this repo; it is imported only when it is
+run, so light commands (convert-*, metrics, triangulate, ...) never load
+torch / ultralytics. Arguments after the subcommand are passed through to
+the script's own parser (`python cvtrack.py track --help`).
+
+With --config, the `defaults:` section of the YAML file supplies per-command
+options (command-line arguments still win), and `batch:` lists the steps
+run by `cvtrack batch`. A step may expand over `for_each:` values, which
+are substituted into its string options with str.format, e.g.
+
+  batch:
+    - command: track-csv
+      for_each: {cam: [13, 2]}
+      video:   videos_rectified/out{cam}.mp4
+      out_csv: runs/detect/cam_{cam}/tracks_cam{cam}.csv
+"""
+import sys, time, argparse, itertools, importlib
+
+# subcommand -> (module, one-line help)
+COMMANDS = {
+    "rectify":           ("rectified_videos",                         "undistort + rectify videos"),
+    "track":             ("track",                                    "track videos → annotated video + labels"),
+    "track-csv":         ("interference",                             "track one video → streaming CSV"),
+    "track-rectified":   ("rectified_interference",                   "rectify and track in one pass"),
+    "track-segmented":   ("segment_track",                            "segment-parallel tracking of one video"),
+    "sweep":             ("tracker_sweep",                            "tracker parameter sweep over cached detections"),
+    "evaluate":          ("evaluate",                                 "MOT metrics of tracker outputs against GT"),
+    "eval-det":          ("evaluate_detections",                      "detection AP on the annotated frames"),
+    "convert-dataset":   ("utils.convert_dataset_to_motchallenged",   "Roboflow labels → MOTChallenge GT"),
+    "convert-trackset":  ("utils.convert_trackset_to_motchallenged",  "track.py labels → MOTChallenge track.txt"),
+    "convert-rectified": ("utils.convert_to_rectified_track",         "remap track centres into the rectified plane"),
+    "triangulate":       ("triangulation",                            "two-camera triangulation → world3d.csv"),
+    "court":             ("visualize_triangulation",                  "floor-align and scale 3-D points onto the court"),
+    "smooth":            ("trajectory_smoothing",                     "Kalman/RTS smoothing of 3-D trajectories"),
+    "metrics":           ("trajectory_metrics",                       "per-track distance / speed metrics"),
+    "report":            ("track_numerical_result",                   "per-video numerical tracking report"),
+    "preprocess":        ("preprocess",                               "CLAHE preprocessing of the training set"),
+    "train":             ("train",                                    "train the YOLO detector"),
+}
+
+def load_config(path):
+    if path is None:
+        return {}
+    import yaml
+    with open(path) as f:
+        return yaml.safe_load(f) or {}
+
+def to_argv(options):
+    """{'conf': 0.3, 'videos': [a, b], 'compare': True} -> ['--conf', '0.3', '--videos', 'a', 'b', '--compare']"""
+    argv = []
+    for key, value in options.items():
+        if value is None or value is False:
+            continue
+        argv.append(f"--{key}")
+        if value is True:
+            continue
+        if isinstance(value, (list, tuple)):
+            argv.extend(str(v) for v in value)
+        else:
+            argv.append(str(value))
+    return argv
+
+def run_command(command, argv, config):
+    """Import the command's module and run its main(); config defaults go first so argv overrides them."""
+    module = importlib.import_module(COMMANDS[command][0])
+    full = to_argv(config.get("defaults", {}).get(command) or {}) + list(argv)
+    return module.main(full)
+
+def expand(step):
+    """One batch step -> [(command, options)], one per for_each combination."""
+    step = dict(step)
+    command = step.pop("command")
+    if command not in COMMANDS:
+        raise ValueError(f"unknown command '{command}' in batch step")
+    loops = step.pop("for_each", None) or {}
+    keys = list(loops)
+    out = []
+    for combo in itertools.product(*(loops[k] if isinstance(loops[k], list) else [loops[k]] for k in keys)):
+        subst = dict(zip(keys, combo))
+        fmt = lambda v: v.format(**subst) if isinstance(v, str) else v
+        out.append((command, {k: [fmt(x) for x in v] if isinstance(v, list) else fmt(v)
+                              for k, v in step.items()}))
+    return out
+
+def run_batch(config, dry_run=False):
+    steps = [job for step in config.get("batch") or [] for job in expand(step)]
+    if not steps:
+        sys.exit("❌  no `batch:` steps in the config")
+    for i, (command, options) in enumerate(steps, 1):
+        argv = to_argv(options)
+        print(f"── [{i}/{len(steps)}] {command} {' '.join(argv)}", flush=True)
+        if dry_run:
+            continue
+        t0 = time.perf_counter()
+        run_command(command, argv, config)
+        print(f"   {command} done in {time.perf_counter() - t0:.1f}s")
+
+def build_parser():
+    epilog = "commands:\n" + "\n".join(f"  {name:<18} {text}" for name, (_, text) in COMMANDS.items()) \
+             + "\n  batch              run the `batch:` steps of --config"
+    parser = argparse.ArgumentParser(prog="cvtrack", epilog=epilog,
+                                     formatter_class=argparse.RawDescriptionHelpFormatter,
+                                     description="Unified command line for the tracking pipeline")
+    parser.add_argument("--config", default=None, help="YAML file with `defaults:` and `batch:` sections")
+    parser.add_argument("command", choices=[*COMMANDS, "batch"], metavar="command")
+    parser.add_argument("args", nargs=argparse.REMAINDER, help="arguments for the command")
+    return parser
+
+def build_batch_parser():
+    parser = argparse.ArgumentParser(prog="cvtrack batch", description="Run the `batch:` steps of --config")
+    parser.add_argument("--dry_run", action="store_true", help="print the steps without running them")
+    return parser
+
+def main(argv=None):
+    args = build_parser().parse_args(argv)
+    config = load_config(args.config)
+    if args.command == "batch":
+        # batch owns its options; anything it does not know is an error, not forwarded
+        batch_args = build_batch_parser().parse_args(args.args)
+        run_batch(config, batch_args.dry_run)
+    else:
+        run_command(args.command, args.args, config)
+
+if __name__ == "__main__":
+    main()
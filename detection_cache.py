@@ -0,0 +1,165 @@
+"""
+On-disk cache of raw (pre-tracker) YOLO detections.
+
+Inference is almost all of the cost of a tracking run, and it does not
+depend on the tracker settings. Detections are stored once per
+(video, weights, conf, iou, imgsz) and tracker-only reruns and parameter
+sweeps replay them through the tracker, producing the same tracks as
+model.track() on the same settings.
+"""
+import os
+import hashlib
+import numpy as np
+
+from id_tracker import IdentityTracker
+
+CACHE_DIR = "runs/detect/cache"
+CHUNK     = 16 * 1024 * 1024
+
+
+def file_digest(path, sample=False):
+    """
+    SHA-1 of a file. With sample=True only the size and the first, middle and
+    last 16 MiB are hashed, which is enough to tell multi-GB videos apart.
+    """
+    h = hashlib.sha1()
+    size = os.path.getsize(path)
+    with open(path, "rb") as f:
+        if sample and size > 3 * CHUNK:
+            h.update(str(size).encode())
+            for off in (0, size // 2, size - CHUNK):
+                f.seek(off)
+                h.update(f.read(CHUNK))
+        else:
+            for block in iter(lambda: f.read(CHUNK), b""):
+                h.update(block)
+    return h.hexdigest()
+
+
+def cache_path(video, weights, conf, iou, imgsz, cache_dir=CACHE_DIR):
+    key = hashlib.sha1("|".join([
+        file_digest(video, sample=True), file_digest(weights),
+        f"{conf:.4f}", f"{iou:.4f}", str(imgsz),
+    ]).encode()).hexdigest()[:16]
+    name = os.path.splitext(os.path.basename(video))[0]
+    return os.path.join(cache_dir, f"{name}_{key}.npz")
+
+
+class Detections:
+    """
+    Per-frame detections stored flat: rows of frame f are
+    xyxy[offsets[f]:offsets[f+1]] (and the same slice of conf / cls).
+    """
+
+    def __init__(self, xyxy, conf, cls, offsets, orig_shape, names):
+        self.xyxy, self.conf, self.cls = xyxy, conf, cls
+        self.offsets    = offsets
+        self.orig_shape = tuple(int(v) for v in orig_shape)
+        self.names      = [str(n) for n in names]
+
+    def __len__(self):
+        return len(self.offsets) - 1
+
+    def frame(self, i):
+        s, e = self.offsets[i], self.offsets[i + 1]
+        return self.xyxy[s:e], self.conf[s:e], self.cls[s:e]
+
+    def save(self, path):
+        os.makedirs(os.path.dirname(path) or ".", exist_ok=True)
+        np.savez_compressed(path, xyxy=self.xyxy, conf=self.conf, cls=self.cls,
+                            offsets=self.offsets, orig_shape=np.array(self.orig_shape),
+                            names=np.array(self.names))
+
+    @classmethod
+    def load(cls, path):
+        z = np.load(path)
+        return cls(z["xyxy"], z["conf"], z["cls"], z["offsets"], z["orig_shape"], z["names"])
+
+
+def detect(model, video, conf, iou, imgsz):
+    """Run the detector over a whole video and collect its raw output."""
+    xyxy, confs, classes, counts = [], [], [], []
+    orig_shape = (0, 0)
+    for result in model.predict(source=video, conf=conf, iou=iou, imgsz=imgsz,
+                                stream=True, save=False, verbose=False):
+        boxes = result.boxes.cpu().numpy()
+        xyxy.append(boxes.xyxy.astype(np.float32))
+        confs.append(boxes.conf.astype(np.float32))
+        classes.append(boxes.cls.astype(np.int16))
+        counts.append(len(boxes))
+        orig_shape = result.orig_shape
+    offsets = np.concatenate([[0], np.cumsum(counts)]).astype(np.int64)
+    return Detections(
+        np.concatenate(xyxy) if xyxy else np.zeros((0, 4), np.float32),
+        np.concatenate(confs) if confs else np.zeros(0, np.float32),
+        np.concatenate(classes) if classes else np.zeros(0, np.int16),
+        offsets, orig_shape, [model.names[i] for i in sorted(model.names)],
+    )
+
+
+def load_or_detect(model_path, video, conf, iou, imgsz=640, cache_dir=CACHE_DIR):
+    """Return cached detections for these settings, running YOLO on a miss."""
+    path = cache_path(video, model_path, conf, iou, imgsz, cache_dir)
+    if os.path.exists(path):
+        print(f"Detection cache hit: {path}")
+        return Detections.load(path)
+
+    from ultralytics import YOLO
+    print(f"Detection cache miss, running inference on {video} ...")
+    dets = detect(YOLO(model_path), video, conf, iou, imgsz)
+    dets.save(path)
+    print(f"Cached {len(dets)} frames of detections -> {path}")
+    return dets
+
+
+def make_tracker(tracker, num_classes, overrides=None):
+    """
+    Build a tracker for replay: 'identity' for id_tracker.IdentityTracker,
+    otherwise an Ultralytics tracker yaml (bytetrack.yaml). overrides are
+    applied on top of the yaml / constructor defaults.
+    """
+    overrides = overrides or {}
+    if tracker == "identity":
+        return IdentityTracker(num_classes=num_classes, **overrides)
+
+    import yaml
+    from types import SimpleNamespace
+    from ultralytics.utils.checks import check_yaml
+    from ultralytics.trackers.byte_tracker import BYTETracker
+
+    with open(check_yaml(tracker)) as f:
+        cfg = yaml.safe_load(f)
+    cfg.update(overrides)
+    if cfg["tracker_type"] != "bytetrack":
+        # BoT-SORT's camera-motion compensation needs the decoded frames
+        raise ValueError(f"replay supports bytetrack and identity, not {cfg['tracker_type']}")
+    # Ultralytics' tracking callback also builds its trackers with frame_rate=30
+    return BYTETracker(args=SimpleNamespace(**cfg), frame_rate=30)
+
+
+def replay(dets, tracker):
+    """
+    Feed cached detections through a tracker. Yields (frame_idx, rows) with
+    rows as (N,7) [x1,y1,x2,y2,id,conf,cls]; like model.track(), a frame
+    where the tracker returns nothing keeps the raw detections with id -1.
+    """
+    if isinstance(tracker, IdentityTracker):
+        step = lambda xyxy, conf, cls: tracker.update(xyxy, conf, cls)
+    else:
+        from ultralytics.engine.results import Boxes
+        step = lambda xyxy, conf, cls: tracker.update(
+            Boxes(np.column_stack([xyxy, conf, cls]).astype(np.float32), dets.orig_shape))
+
+    h, w = dets.orig_shape
+    for i in range(len(dets)):
+        xyxy, conf, cls = dets.frame(i)
+        tracks = step(xyxy, conf, cls)
+        if len(tracks):
+            # Results.update() clips tracker boxes to the image in a live run
+            rows = np.array(tracks, dtype=float)[:, :7]
+            rows[:, [0, 2]] = rows[:, [0, 2]].clip(0, w)
+            rows[:, [1, 3]] = rows[:, [1, 3]].clip(0, h)
+        else:
+            rows = np.column_stack([xyxy, -np.ones(len(xyxy)), conf, cls])
+        yield i, rows
+
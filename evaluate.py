@@ -1,9 +1,12 @@
 import os
+import argparse
 import numpy as np
 import pandas as pd
 import motmetrics as mm
 from scipy.optimize import linear_sum_assignment
 
+from box_utils import box_iou
+
 # ── CONFIG ─────────────────────────────────────────────────────────────────────
 # Paths
 PARENT_ROOT = 'result/2DTracking/out13/evaluation'
@@ -35,23 +38,12 @@ def iou_matrix(boxes1, boxes2):
     Compute IoU matrix between two arrays of boxes [x,y,w,h].
     Returns an (N1 x N2) array of IoU values.
     """
-    N1, N2 = boxes1.shape[0], boxes2.shape[0]
-    ious = np.zeros((N1, N2), dtype=float)
-    for i in range(N1):
-        x1, y1, w1, h1 = boxes1[i]
-        xa1, ya1, xa2, ya2 = x1, y1, x1 + w1, y1 + h1
-        for j in range(N2):
-            x2, y2, w2, h2 = boxes2[j]
-            xb1, yb1, xb2, yb2 = x2, y2, x2 + w2, y2 + h2
-            inter_w = max(0, min(xa2, xb2) - max(xa1, xb1))
-            inter_h = max(0, min(ya2, yb2) - max(ya1, yb1))
-            inter   = inter_w * inter_h
-            union   = w1 * h1 + w2 * h2 - inter
-            if union > 0:
-                ious[i, j] = inter / union
-    return ious
-
-def evaluate_tracking(gt_path, trk_path):
+    a = np.asarray(boxes1, dtype=float).reshape(-1, 4)
+    b = np.asarray(boxes2, dtype=float).reshape(-1, 4)
+    return box_iou(np.hstack([a[:, :2], a[:, :2] + a[:, 2:]]),
+                   np.hstack([b[:, :2], b[:, :2] + b[:, 2:]]))
+
+def evaluate_tracking(gt_path, trk_path, name='Results'):
     # Load GT (scaled) and tracker (unscaled)
     gt  = load_motchallenge(gt_path, scale=(SCALE_X, SCALE_Y))
     trk = load_motchallenge(trk_path, scale=None)
@@ -82,7 +74,7 @@ def evaluate_tracking(gt_path, trk_path):
 
     # Rename for clarity
     summary = summary.rename(
-        index={'eval':'Results'},
+        index={'eval':name},
         columns={'mota':'MOTA','idf1':'IDF1'}
     )
 
@@ -91,6 +83,7 @@ def evaluate_tracking(gt_path, trk_path):
         formatters=mh.formatters, 
         namemap={'MOTA':'MOTA','IDF1':'IDF1'}
     ))
+    return summary
 
 def compute_average_iou(gt_path, trk_path):
     """
@@ -121,6 +114,17 @@ def compute_average_iou(gt_path, trk_path):
     print(f"Average IoU over {len(all_ious)} matches: {avg_iou:.4f}")
     return avg_iou
 
+def main(argv=None):
+    p = argparse.ArgumentParser()
+    p.add_argument("--gt",  default=GT_PATH, help="MOTChallenge GT file (640×640 coords)")
+    p.add_argument("--trk", nargs="+", default=[TRK_PATH],
+                   help="one or more tracker outputs, e.g. ByteTrack and identity runs")
+    args = p.parse_args(argv)
+
+    for trk_path in args.trk:
+        print(f"── {trk_path}")
+        evaluate_tracking(args.gt, trk_path, name=trk_path)
+        compute_average_iou(args.gt, trk_path)
+
 if __name__ == "__main__":
-    evaluate_tracking(GT_PATH, TRK_PATH)
-    compute_average_iou(GT_PATH, TRK_PATH)
+    main()
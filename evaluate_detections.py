@@ -0,0 +1,180 @@
+#!/usr/bin/env python3
+"""
+Detection-only evaluation on the annotated frames of a video.
+
+The GT from utils/convert_dataset_to_motchallenged.py covers only every
+(ORIG_FPS // ANNOT_FPS)-th frame, so instead of tracking the whole video this
+script cap.grab()s past the frames without GT, decodes just the annotated
+ones, runs them through the detector in batches and reports per-class
+precision / recall / AP and the IoU of matched boxes.
+"""
+import os, time, argparse
+import cv2
+import numpy as np
+import pandas as pd
+
+from evaluate import load_motchallenge, SCALE_X, SCALE_Y
+from box_utils import box_iou
+
+# ─── CONFIG ──────────────────────────────────────────────────────────────
+MODEL_PATH     = "runs/detect/train/weights/best.pt"
+VIDEO_SRC      = "videos/out13.mp4"
+GT_PATH        = "result/2DTracking/out13/evaluation/gt.txt"
+CONF_THRESHOLD = 0.25     # operating point for precision / recall
+IOU_THRESHOLD  = 0.45     # NMS
+IMG_SIZE       = 640
+BATCH          = 16
+OUT_CSV        = "result/2DTracking/out13/evaluation/detection_metrics.csv"
+IOU_THRS       = np.linspace(0.5, 0.95, 10)
+# ────────────────────────────────────────────────────────────────────────
+
+def load_gt(gt_path):
+    """GT boxes per 0-based video frame as (xyxy, cls); the MOT id column holds the class."""
+    gt = load_motchallenge(gt_path, scale=(SCALE_X, SCALE_Y))
+    out = {}
+    for f, g in gt.groupby('FrameId'):
+        xywh = g[['X','Y','W','H']].to_numpy(dtype=float)
+        out[int(f) - 1] = (np.column_stack([xywh[:, :2], xywh[:, :2] + xywh[:, 2:]]),
+                           g.Id.to_numpy(dtype=int))
+    return out
+
+def annotated_frames(video, frames):
+    """
+    Yield (frame_idx, image) for the requested frames only; the others are
+    grabbed (demuxed and skipped) but never decoded into an image.
+    """
+    wanted = set(frames)
+    last = max(wanted)
+    cap = cv2.VideoCapture(video)
+    if not cap.isOpened():
+        raise RuntimeError(f"Cannot open video '{video}'")
+    for idx in range(last + 1):
+        if not cap.grab():
+            break
+        if idx in wanted:
+            ok, img = cap.retrieve()
+            if ok:
+                yield idx, img
+    cap.release()
+
+def detect_batched(model, frames, batch):
+    """Run the model over (frame_idx, image) pairs in batches; yields (frame_idx, boxes)."""
+    buf = []
+    def flush():
+        results = model.predict(source=[img for _, img in buf], conf=0.001, iou=IOU_THRESHOLD,
+                                imgsz=IMG_SIZE, verbose=False)
+        for (idx, _), r in zip(buf, results):
+            yield idx, r.boxes.cpu().numpy()
+        buf.clear()
+
+    for item in frames:
+        buf.append(item)
+        if len(buf) == batch:
+            yield from flush()
+    if buf:
+        yield from flush()
+
+def match_frame(p_xyxy, p_conf, p_cls, g_xyxy, g_cls, iou_thrs):
+    """
+    Greedy, confidence-ordered matching per class (COCO style).
+    Returns tp (P, len(iou_thrs)) bool and the IoU of each prediction's
+    match at the first threshold (0 if unmatched).
+    """
+    tp = np.zeros((len(p_conf), len(iou_thrs)), dtype=bool)
+    best = np.zeros(len(p_conf))
+    if not len(p_conf) or not len(g_cls):
+        return tp, best
+    iou = box_iou(p_xyxy, g_xyxy)
+    iou[p_cls[:, None] != g_cls[None, :]] = 0.0
+    order = np.argsort(-p_conf, kind="stable")
+    for k, thr in enumerate(iou_thrs):
+        taken = np.zeros(len(g_cls), dtype=bool)
+        for i in order:
+            cand = np.where(taken, 0.0, iou[i])
+            j = int(cand.argmax())
+            if cand[j] >= thr:
+                taken[j] = True
+                tp[i, k] = True
+                if k == 0:
+                    best[i] = cand[j]
+    return tp, best
+
+def average_precision(tp, conf, n_gt):
+    """101-point interpolated AP for one class; tp is (P,) bool."""
+    if n_gt == 0 or len(tp) == 0:
+        return 0.0
+    order = np.argsort(-conf, kind="stable")
+    tpc = np.cumsum(tp[order])
+    fpc = np.cumsum(~tp[order])
+    recall = tpc / n_gt
+    precision = tpc / (tpc + fpc)
+    # precision envelope
+    precision = np.maximum.accumulate(precision[::-1])[::-1]
+    r = np.linspace(0, 1, 101)
+    idx = np.searchsorted(recall, r, side="left")
+    return float(np.mean(np.where(idx < len(precision), precision[np.minimum(idx, len(precision) - 1)], 0.0)))
+
+def evaluate(model, video, gt_path, batch=BATCH):
+    gt = load_gt(gt_path)
+    names = model.names
+    preds = {}
+    t0 = time.perf_counter()
+    for idx, boxes in detect_batched(model, annotated_frames(video, gt.keys()), batch):
+        preds[idx] = (boxes.xyxy, boxes.conf, boxes.cls.astype(int))
+    dt = time.perf_counter() - t0
+    print(f"Decoded and inferred {len(preds)} annotated frames in {dt:.1f}s")
+
+    tps, confs, classes, ious = [], [], [], []
+    n_gt = np.zeros(len(names), dtype=int)
+    for idx, (g_xyxy, g_cls) in gt.items():
+        np.add.at(n_gt, g_cls, 1)
+        if idx not in preds:
+            continue
+        p_xyxy, p_conf, p_cls = preds[idx]
+        tp, best = match_frame(p_xyxy, p_conf, p_cls, g_xyxy, g_cls, IOU_THRS)
+        tps.append(tp); confs.append(p_conf); classes.append(p_cls); ious.append(best)
+    tp    = np.concatenate(tps) if tps else np.zeros((0, len(IOU_THRS)), dtype=bool)
+    conf  = np.concatenate(confs) if confs else np.zeros(0)
+    cls   = np.concatenate(classes) if classes else np.zeros(0, dtype=int)
+    iou   = np.concatenate(ious) if ious else np.zeros(0)
+
+    rows = []
+    for c in sorted(names):
+        m  = cls == c
+        op = m & (conf >= CONF_THRESHOLD)          # detections at the operating point
+        n_tp = int(tp[op, 0].sum())
+        aps = [average_precision(tp[m, k], conf[m], n_gt[c]) for k in range(len(IOU_THRS))]
+        rows.append({
+            "class": names[c],
+            "n_gt": int(n_gt[c]),
+            "n_det": int(op.sum()),
+            "precision": n_tp / op.sum() if op.sum() else 0.0,
+            "recall": n_tp / n_gt[c] if n_gt[c] else 0.0,
+            "AP50": aps[0],
+            "AP50_95": float(np.mean(aps)),
+            "mean_IoU": float(iou[op & tp[:, 0]].mean()) if n_tp else 0.0,
+        })
+    table = pd.DataFrame(rows)
+    present = table[table.n_gt > 0]
+    print(table.to_string(index=False, float_format="%.3f"))
+    print(f"mAP50 {present.AP50.mean():.3f}  mAP50-95 {present.AP50_95.mean():.3f}  "
+          f"(over {len(present)} classes with GT)")
+    return table
+
+def main(argv=None):
+    p = argparse.ArgumentParser()
+    p.add_argument("--model",   default=MODEL_PATH, help="checkpoint to validate, e.g. from train.py")
+    p.add_argument("--video",   default=VIDEO_SRC)
+    p.add_argument("--gt",      default=GT_PATH)
+    p.add_argument("--batch",   type=int, default=BATCH)
+    p.add_argument("--out_csv", default=OUT_CSV)
+    args = p.parse_args(argv)
+
+    from ultralytics import YOLO
+    table = evaluate(YOLO(args.model), args.video, args.gt, args.batch)
+    os.makedirs(os.path.dirname(args.out_csv) or ".", exist_ok=True)
+    table.to_csv(args.out_csv, index=False)
+    print("✅ wrote", args.out_csv)
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,181 @@
+"""
+Identity-aware multi-object tracker in pure NumPy.
+
+The detector classes in data.yaml are already player identities (Red_0,
+White_13, ..., Ball), so instead of ByteTrack's class-agnostic association
+every track keeps a confidence-weighted vote over classes and is locked to
+the identity that wins it. Association is one batched IoU matrix plus a
+Hungarian assignment per frame; a detection that finds no overlapping
+track is re-attached to a lost track with the same identity before a new
+ID is opened, which is what stops IDs fragmenting after occlusions.
+"""
+import time
+import numpy as np
+from scipy.optimize import linear_sum_assignment
+
+from box_utils import box_iou
+
+
+class IdentityTracker:
+    """
+    Track state is kept as flat arrays (one row per track) and updated in
+    place each frame:
+      boxes  (T,4)  last box, xyxy
+      vel    (T,4)  per-frame box velocity (constant-velocity prediction)
+      votes  (T,C)  decayed sum of detection confidence per class
+      ids    (T,)   track IDs
+      age    (T,)   frames since the track was last matched
+    """
+
+    def __init__(self, num_classes, iou_thresh=0.3, max_age=30, reid_age=250,
+                 class_weight=0.5, vote_decay=0.98, new_track_thresh=0.25,
+                 unique_classes=None):
+        self.num_classes      = num_classes
+        self.iou_thresh       = iou_thresh        # min IoU for an IoU match
+        self.max_age          = max_age           # frames a lost track is still IoU-matched
+        self.reid_age         = reid_age          # frames a lost track can be re-attached by identity
+        self.class_weight     = class_weight      # cost for a class disagreeing with the track vote
+        self.vote_decay       = vote_decay
+        self.new_track_thresh = new_track_thresh  # min confidence to open a new track
+        # classes that are a single physical object (all of them by default)
+        self.unique_classes = (np.ones(num_classes, dtype=bool) if unique_classes is None
+                               else np.isin(np.arange(num_classes), unique_classes))
+        self.reset()
+
+    def reset(self):
+        self.boxes   = np.zeros((0, 4))
+        self.vel     = np.zeros((0, 4))
+        self.votes   = np.zeros((0, self.num_classes))
+        self.ids     = np.zeros(0, dtype=int)
+        self.age     = np.zeros(0, dtype=int)
+        self.next_id = 1
+
+    @property
+    def identity(self):
+        return self.votes.argmax(axis=1)
+
+    def update(self, xyxy, conf, cls):
+        """
+        Consume one frame of raw detections.
+        Returns an (M,8) array [x1,y1,x2,y2,id,conf,cls,det_idx] for the
+        tracks matched in this frame (same layout as Ultralytics' trackers),
+        where cls is the track's voted identity.
+        """
+        xyxy = np.asarray(xyxy, dtype=float).reshape(-1, 4)
+        conf = np.asarray(conf, dtype=float).ravel()
+        cls  = np.asarray(cls).astype(int).ravel()
+        D, T = len(xyxy), len(self.ids)
+
+        # predict
+        self.boxes += self.vel
+        self.age   += 1
+
+        det_track = np.full(D, -1)
+        if D and T:
+            share = self.votes / np.maximum(self.votes.sum(axis=1, keepdims=True), 1e-9)
+            iou   = box_iou(self.boxes, xyxy)
+            cost  = 1.0 - iou + self.class_weight * (1.0 - share[:, cls])
+            gate  = (iou >= self.iou_thresh) & (self.age[:, None] <= self.max_age)
+            cost  = np.where(gate, cost, 1e6)
+            rows, cols = linear_sum_assignment(cost)
+            ok = gate[rows, cols]
+            det_track[cols[ok]] = rows[ok]
+
+        # re-attach unmatched detections of unique identities to lost tracks
+        identity = self.identity
+        matched = np.zeros(T, dtype=bool)
+        matched[det_track[det_track >= 0]] = True
+        reattached = np.zeros(T, dtype=bool)
+        for d in np.flatnonzero(det_track < 0)[np.argsort(-conf[det_track < 0])]:
+            if not self.unique_classes[cls[d]]:
+                continue
+            cand = np.flatnonzero(~matched & (identity == cls[d]) & (self.age <= self.reid_age))
+            if len(cand):
+                t = cand[np.argmin(self.age[cand])]
+                det_track[d] = t
+                matched[t] = reattached[t] = True
+
+        # update matched tracks
+        d_idx = np.flatnonzero(det_track >= 0)
+        t_idx = det_track[d_idx]
+        # re-attached tracks jumped position: restart their motion model
+        reid  = reattached[t_idx] | (self.age[t_idx] > self.max_age)
+        self.vel[t_idx] = np.where(reid[:, None], 0.0,
+                                   0.5 * self.vel[t_idx] + 0.5 * (xyxy[d_idx] - self.boxes[t_idx]))
+        self.boxes[t_idx] = xyxy[d_idx]
+        self.votes *= self.vote_decay
+        np.add.at(self.votes, (t_idx, cls[d_idx]), conf[d_idx])
+        self.age[t_idx] = 0
+
+        # open new tracks
+        new = np.flatnonzero((det_track < 0) & (conf >= self.new_track_thresh))
+        if len(new):
+            votes = np.zeros((len(new), self.num_classes))
+            votes[np.arange(len(new)), cls[new]] = conf[new]
+            self.boxes = np.vstack([self.boxes, xyxy[new]])
+            self.vel   = np.vstack([self.vel, np.zeros((len(new), 4))])
+            self.votes = np.vstack([self.votes, votes])
+            self.ids   = np.concatenate([self.ids, self.next_id + np.arange(len(new))])
+            self.age   = np.concatenate([self.age, np.zeros(len(new), dtype=int)])
+            self.next_id += len(new)
+            det_track[new] = np.arange(T, T + len(new))
+
+        # drop tracks that can no longer be re-identified
+        keep = self.age <= self.reid_age
+        out_d = np.flatnonzero(det_track >= 0)
+        out_t = det_track[out_d]
+        out = np.column_stack([
+            xyxy[out_d], self.ids[out_t], conf[out_d], self.identity[out_t], out_d
+        ]) if len(out_d) else np.zeros((0, 8))
+        if not keep.all():
+            self.boxes, self.vel, self.votes = self.boxes[keep], self.vel[keep], self.votes[keep]
+            self.ids, self.age = self.ids[keep], self.age[keep]
+        return out
+
+
+def track_result(tracker, result):
+    """
+    Run the tracker on an Ultralytics detection Results object and write
+    the track IDs back into it, the way Ultralytics' own tracker callback
+    does, so result.boxes.id / result.plot() behave as with model.track().
+    """
+    import torch
+
+    boxes = result.boxes
+    if boxes is None or len(boxes) == 0:
+        tracker.update(np.zeros((0, 4)), np.zeros(0), np.zeros(0))
+        return result
+    tracks = tracker.update(boxes.xyxy.cpu().numpy(),
+                            boxes.conf.cpu().numpy(),
+                            boxes.cls.cpu().numpy())
+    if len(tracks) == 0:
+        return result
+    result = result[tracks[:, -1].astype(int)]
+    result.update(boxes=torch.as_tensor(tracks[:, :-1]))
+    return result
+
+
+def stream_tracks(model, source, tracker, stats=None, **det_args):
+    """
+    Yield tracked Results for every frame of `source` with either kind of
+    tracker: an Ultralytics tracker yaml goes through model.track(), while
+    'identity' or an IdentityTracker instance goes through model.predict()
+    + track_result(). Pass an instance to keep identity state across calls
+    (e.g. one frame per call), as persist=True does for model.track().
+    det_args (conf, iou, imgsz, persist, verbose, ...) go to the model call;
+    when stats is a dict, stats["tracker_s"] accumulates the time spent in
+    the IdentityTracker.
+    """
+    if isinstance(tracker, str) and tracker != "identity":
+        yield from model.track(source=source, tracker=tracker, stream=True, save=False, **det_args)
+        return
+
+    if not isinstance(tracker, IdentityTracker):
+        tracker = IdentityTracker(num_classes=len(model.names))
+    det_args.pop("persist", None)
+    for result in model.predict(source=source, stream=True, save=False, **det_args):
+        t0 = time.perf_counter()
+        result = track_result(tracker, result)
+        if stats is not None:
+            stats["tracker_s"] = stats.get("tracker_s", 0.0) + time.perf_counter() - t0
+        yield result
@@ -1,52 +1,93 @@
 #!/usr/bin/env python3
-import os, csv, numpy as np
-from ultralytics import YOLO
+import os, csv, time, argparse, numpy as np
+from id_tracker import stream_tracks
+from detection_cache import load_or_detect, make_tracker, replay
 
-# ─── CONFIG ──────────────────────────────────────────────────────────────
+# ─── CONFIG (defaults; override on the command line or via cvtrack) ─────
 MODEL_PATH     = "runs/detect/train/weights/best.pt"
 VIDEO_SRC      = "videos_rectified/out13.mp4"
 TRACKER_CONFIG = "bytetrack.yaml"
 CONF_THRESHOLD = 0.25
 IOU_THRESHOLD  = 0.45
+IMG_SIZE       = 640
 OUT_CSV        = "runs/detect/cam_13/tracks_cam13.csv"
 # ────────────────────────────────────────────────────────────────────────
 
-# Prepare model
-model = YOLO(MODEL_PATH)
-
-# Prepare CSV writer
-os.makedirs(os.path.dirname(OUT_CSV) or ".", exist_ok=True)
-with open(OUT_CSV, "w", newline="") as csvf:
-    writer = csv.writer(csvf)
-    writer.writerow(["frame","id","x1","y1","x2","y2","score"])
-
-    # Stream inference (no full-list in RAM)
-    stream = model.track(
-        source=VIDEO_SRC,
-        tracker=TRACKER_CONFIG,
-        conf=CONF_THRESHOLD,
-        iou=IOU_THRESHOLD,
-        stream=True,
-        save=False
-    )
-
-    for frame_idx, result in enumerate(stream):
-        boxes = result.boxes
-        # skip if no boxes object or no detections
-        if boxes is None or boxes.xyxy is None:
-            continue
-
-        # fetch tensors safely
-        xyxy = boxes.xyxy.cpu().numpy()         # (N,4)
-        confs = (boxes.conf.cpu().numpy()
-                 if boxes.conf is not None
-                 else np.ones(len(xyxy), dtype=float))
-        ids   = (boxes.id.cpu().numpy().astype(int)
-                 if boxes.id is not None
-                 else -1 * np.ones(len(xyxy), dtype=int))
-
-        # write each detection
-        for tid, (x1,y1,x2,y2), conf in zip(ids, xyxy, confs):
-            writer.writerow([frame_idx, tid, x1, y1, x2, y2, conf])
-
-print(f"✅ Wrote streaming tracks to {OUT_CSV}")
+def build_parser():
+    parser = argparse.ArgumentParser(description="Track one video into a streaming CSV")
+    parser.add_argument("--video", default=VIDEO_SRC)
+    parser.add_argument("--out_csv", default=OUT_CSV)
+    parser.add_argument("--model", default=MODEL_PATH)
+    parser.add_argument("--conf", type=float, default=CONF_THRESHOLD)
+    parser.add_argument("--iou", type=float, default=IOU_THRESHOLD)
+    parser.add_argument("--imgsz", type=int, default=IMG_SIZE)
+    parser.add_argument("--tracker", default=TRACKER_CONFIG,
+                        help="Ultralytics tracker yaml, or 'identity' for id_tracker.IdentityTracker")
+    parser.add_argument("--det_cache", default=None, metavar="DIR",
+                        help="replay cached detections from DIR (filled on first run)")
+    return parser
+
+def main(argv=None):
+    args = build_parser().parse_args(argv)
+
+    # Prepare model, or resolve the cached detections (running inference on a
+    # cache miss), before the CSV is opened so a failure keeps the old result
+    model, dets = None, None
+    if args.det_cache:
+        dets = load_or_detect(args.model, args.video, args.conf, args.iou,
+                              args.imgsz, args.det_cache)
+    else:
+        from ultralytics import YOLO
+        model = YOLO(args.model)
+
+    # Prepare CSV writer
+    os.makedirs(os.path.dirname(args.out_csv) or ".", exist_ok=True)
+    with open(args.out_csv, "w", newline="") as csvf:
+        writer = csv.writer(csvf)
+        writer.writerow(["frame","id","x1","y1","x2","y2","score"])
+
+        n_frames, stats = 0, {}
+        if dets is not None:
+            # Tracker-only rerun over cached raw detections
+            tracker = make_tracker(args.tracker, num_classes=len(dets.names))
+            t_start = time.perf_counter()
+            for frame_idx, rows in replay(dets, tracker):
+                n_frames += 1
+                for x1, y1, x2, y2, tid, conf, _ in rows:
+                    writer.writerow([frame_idx, int(tid), x1, y1, x2, y2, conf])
+            stats["tracker_s"] = time.perf_counter() - t_start
+        else:
+            # Stream inference (no full-list in RAM)
+            stream = stream_tracks(model, args.video, args.tracker, stats,
+                                   conf=args.conf, iou=args.iou, imgsz=args.imgsz)
+
+            t_start = time.perf_counter()
+            for frame_idx, result in enumerate(stream):
+                n_frames += 1
+
+                boxes = result.boxes
+                # skip if no boxes object or no detections
+                if boxes is None or boxes.xyxy is None:
+                    continue
+
+                # fetch tensors safely
+                xyxy = boxes.xyxy.cpu().numpy()         # (N,4)
+                confs = (boxes.conf.cpu().numpy()
+                         if boxes.conf is not None
+                         else np.ones(len(xyxy), dtype=float))
+                ids   = (boxes.id.cpu().numpy().astype(int)
+                         if boxes.id is not None
+                         else -1 * np.ones(len(xyxy), dtype=int))
+
+                # write each detection
+                for tid, (x1,y1,x2,y2), conf in zip(ids, xyxy, confs):
+                    writer.writerow([frame_idx, tid, x1, y1, x2, y2, conf])
+
+    t_total = time.perf_counter() - t_start
+    print(f"✅ Wrote streaming tracks to {args.out_csv}")
+    if n_frames:
+        print(f"   {args.tracker}: {1000 * t_total / n_frames:.1f} ms/frame end-to-end"
+              + (f", {1000 * stats['tracker_s'] / n_frames:.2f} ms/frame in the tracker" if "tracker_s" in stats else ""))
+
+if __name__ == "__main__":
+    main()
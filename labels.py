@@ -0,0 +1,31 @@
+"""
+Per-frame label files written by the tracking scripts.
+
+labels/NNNNNN.txt holds one line per box,
+  <cls> <x1> <y1> <x2> <y2> <track_id> <conf>
+in pixels of the tracked video, with track_id -1 for untracked boxes; this
+is what utils/convert_trackset_to_motchallenged.py and
+track_numerical_result.py read back.
+"""
+import os
+import numpy as np
+
+
+def label_path(label_dir, frame_idx):
+    return os.path.join(label_dir, f"{frame_idx:06d}.txt")
+
+
+def boxes_to_rows(boxes):
+    """Ultralytics Boxes -> (N,7) rows [x1,y1,x2,y2,id,conf,cls] (id -1 if untracked)."""
+    if boxes is None or boxes.xyxy is None or len(boxes.xyxy) == 0:
+        return np.zeros((0, 7))
+    xyxy = boxes.xyxy.cpu().numpy()
+    ids  = boxes.id.cpu().numpy() if boxes.id is not None else -np.ones(len(xyxy))
+    return np.column_stack([xyxy, ids, boxes.conf.cpu().numpy(), boxes.cls.cpu().numpy()])
+
+
+def write_labels(txt_path, rows):
+    """Write one frame of (N,7) [x1,y1,x2,y2,id,conf,cls] rows."""
+    with open(txt_path, "w") as f:
+        for x1, y1, x2, y2, tid, conf, cls in rows:
+            f.write(f"{int(cls)} {x1:.1f} {y1:.1f} {x2:.1f} {y2:.1f} {int(tid)} {conf:.3f}\n")
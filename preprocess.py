@@ -2,6 +2,7 @@ import cv2
 import os
 import glob
 import shutil
+import argparse
 
 def batch_clahe(input_img_dir, output_img_dir, clip_limit=2.0, tile_grid=(8,8), exts=('jpg','jpeg','png')):
     """
@@ -42,13 +43,26 @@ def copy_labels(input_label_dir, output_label_dir):
 INPUT_IMG_DIR   = "train/images"
 INPUT_LABEL_DIR = "train/labels"
 OUTPUT_ROOT     = "preprocessed-train"
-    
-# output sub-folders
-OUTPUT_IMG_DIR   = os.path.join(OUTPUT_ROOT, "images")
-OUTPUT_LABEL_DIR = os.path.join(OUTPUT_ROOT, "labels")
 
-# 1) Process images
-batch_clahe(INPUT_IMG_DIR, OUTPUT_IMG_DIR, clip_limit=2.0, tile_grid=(8,8))
 
-# 2) Copy labels folder
-copy_labels(INPUT_LABEL_DIR, OUTPUT_LABEL_DIR)
+def main(argv=None):
+    p = argparse.ArgumentParser(description="CLAHE-equalise the training images and copy their labels")
+    p.add_argument("--input_img_dir",   default=INPUT_IMG_DIR)
+    p.add_argument("--input_label_dir", default=INPUT_LABEL_DIR)
+    p.add_argument("--output_root",     default=OUTPUT_ROOT)
+    p.add_argument("--clip_limit", type=float, default=2.0)
+    args = p.parse_args(argv)
+
+    # output sub-folders
+    output_img_dir   = os.path.join(args.output_root, "images")
+    output_label_dir = os.path.join(args.output_root, "labels")
+
+    # 1) Process images
+    batch_clahe(args.input_img_dir, output_img_dir, clip_limit=args.clip_limit, tile_grid=(8,8))
+
+    # 2) Copy labels folder
+    copy_labels(args.input_label_dir, output_label_dir)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,185 @@
+#!/usr/bin/env python3
+"""
+Fused rectify + tracking: decode the raw videos/outNN.mp4, undistort every
+frame in memory with the cached per-camera map and hand it straight to the
+tracker. This skips the videos_rectified/*.mp4 encode/decode round-trip
+done by rectified_videos.py followed by track.py / interference.py.
+"""
+import os, time, argparse, tempfile
+import cv2
+
+from camera_model import load_camera
+from rectified_videos import calib_path_for_video, rectified_frames, process_video
+from labels import label_path, boxes_to_rows, write_labels
+
+# === Configuration (defaults; override on the command line or via cvtrack) ===
+MODEL_PATH      = "runs/detect/train/weights/best.pt"
+VIDEO_SRCS      = ["videos/out13.mp4", "videos/out2.mp4"]
+OUTPUT_ROOT     = "result/2DTracking_rectified"
+TRACKER_CONFIG  = "bytetrack.yaml"
+CONF_THRESHOLD  = 0.25
+IOU_THRESHOLD   = 0.45
+WRITE_RECTIFIED = False   # also save the rectified video as a side output
+WRITE_ANNOTATED = True    # save the annotated tracking video
+COMPARE_TWO_PASS = False  # also time the old rectify-to-disk + track path
+DISK_SAMPLE     = 50      # rectified frames encoded to estimate the avoided intermediate video
+
+
+def build_parser():
+    p = argparse.ArgumentParser(description="Track raw videos with in-memory rectification")
+    p.add_argument("--videos", nargs="+", default=VIDEO_SRCS)
+    p.add_argument("--output_root", default=OUTPUT_ROOT)
+    p.add_argument("--model", default=MODEL_PATH)
+    p.add_argument("--tracker", default=TRACKER_CONFIG)
+    p.add_argument("--conf", type=float, default=CONF_THRESHOLD)
+    p.add_argument("--iou", type=float, default=IOU_THRESHOLD)
+    p.add_argument("--write_rectified", action="store_true", default=WRITE_RECTIFIED,
+                   help="also save the rectified video as a side output")
+    p.add_argument("--no_annotated", dest="write_annotated", action="store_false",
+                   default=WRITE_ANNOTATED, help="skip the annotated tracking video")
+    p.add_argument("--compare", action="store_true", default=COMPARE_TWO_PASS,
+                   help="also time the old rectify-to-disk + track path")
+    p.add_argument("--disk_sample", type=int, default=DISK_SAMPLE,
+                   help="rectified frames to encode (mp4v, as rectified_videos.py) to estimate "
+                        "the intermediate video this path avoids; 0 to skip")
+    return p
+
+
+def track_fused(args, vid_path, calib_path, out_dir):
+    """Track one raw video with in-memory rectification. Returns timing stats."""
+    from ultralytics import YOLO
+
+    vid_name      = os.path.splitext(os.path.basename(vid_path))[0]
+    out_label_dir = os.path.join(out_dir, "labels")
+    os.makedirs(out_label_dir, exist_ok=True)
+
+    cap = cv2.VideoCapture(vid_path)
+    if not cap.isOpened():
+        raise RuntimeError(f"Cannot open video '{vid_path}'")
+    fps = cap.get(cv2.CAP_PROP_FPS)
+    w   = int(cap.get(cv2.CAP_PROP_FRAME_WIDTH))
+    h   = int(cap.get(cv2.CAP_PROP_FRAME_HEIGHT))
+
+    t0 = time.perf_counter()
+    map_x, map_y = load_camera(calib_path).undistort_map(w, h)
+    t_map = time.perf_counter() - t0
+
+    fourcc = cv2.VideoWriter_fourcc(*"mp4v")
+    rect_path = os.path.join(out_dir, f"{vid_name}_rectified.mp4")
+    rect_writer = cv2.VideoWriter(rect_path, fourcc, fps, (w, h)) if args.write_rectified else None
+    ann_path = os.path.join(out_dir, f"{vid_name}_annotated.mp4")
+    ann_writer = cv2.VideoWriter(ann_path, fourcc, fps, (w, h)) if args.write_annotated else None
+
+    # Encode the first few rectified frames the way process_video() does to
+    # measure the intermediate video (size and encode time) this path skips
+    sample_writer, n_sample = None, 0
+    if not args.write_rectified and args.disk_sample > 0:
+        fd, sample_path = tempfile.mkstemp(suffix=".mp4")
+        os.close(fd)
+        sample_writer = cv2.VideoWriter(sample_path, fourcc, fps, (w, h))
+
+    # Fresh model per video so the persistent tracker state starts clean
+    model = YOLO(args.model)
+    t_track, t_sample = 0.0, 0.0
+    frame_idx = -1
+    t_start = time.perf_counter()
+    for frame_idx, frame in enumerate(rectified_frames(cap, map_x, map_y, writer=rect_writer)):
+        t1 = time.perf_counter()
+        result = model.track(
+            source=frame,
+            tracker=args.tracker,
+            conf=args.conf,
+            iou=args.iou,
+            persist=True,
+            verbose=False
+        )[0]
+        t_track += time.perf_counter() - t1
+
+        if ann_writer is not None:
+            ann_writer.write(result.plot())
+        write_labels(label_path(out_label_dir, frame_idx), boxes_to_rows(result.boxes))
+
+        if sample_writer is not None and n_sample < args.disk_sample:
+            t1 = time.perf_counter()
+            sample_writer.write(frame)
+            n_sample += 1
+            t_sample += time.perf_counter() - t1
+
+        if (frame_idx + 1) % 50 == 0:
+            print(f"Processed {frame_idx + 1} frames for {vid_path}")
+    t_total = time.perf_counter() - t_start + t_map - t_sample
+
+    cap.release()
+    for wr in (rect_writer, ann_writer, sample_writer):
+        if wr is not None:
+            wr.release()
+
+    # scale the sample to the whole video
+    avoided_bytes = avoided_encode_s = None
+    if sample_writer is not None:
+        if n_sample:
+            scale = (frame_idx + 1) / n_sample
+            avoided_bytes    = os.path.getsize(sample_path) * scale
+            avoided_encode_s = t_sample * scale
+        os.remove(sample_path)
+
+    return {
+        "frames": frame_idx + 1,
+        "map_s": t_map,
+        "track_s": t_track,
+        "total_s": t_total,
+        "rectified_bytes": os.path.getsize(rect_path) if args.write_rectified else 0,
+        "avoided_bytes": avoided_bytes,
+        "avoided_encode_s": avoided_encode_s,
+        "sampled_frames": n_sample,
+    }
+
+
+def track_two_pass(args, vid_path, calib_path):
+    """Old path: rectify to an mp4 on disk, then decode it again for tracking."""
+    from ultralytics import YOLO
+    with tempfile.TemporaryDirectory() as tmp:
+        rect_path = os.path.join(tmp, os.path.basename(vid_path))
+        t0 = time.perf_counter()
+        process_video(vid_path, calib_path, rect_path)
+        rect_bytes = os.path.getsize(rect_path)
+        model = YOLO(args.model)
+        for _ in model.track(source=rect_path, tracker=args.tracker, conf=args.conf,
+                             iou=args.iou, stream=True, save=False, verbose=False):
+            pass
+        return {"total_s": time.perf_counter() - t0, "rectified_bytes": rect_bytes}
+
+
+def main(argv=None):
+    args = build_parser().parse_args(argv)
+    for vid_path in args.videos:
+        vid_name   = os.path.splitext(os.path.basename(vid_path))[0]
+        calib_path = calib_path_for_video(vid_path)
+        if calib_path is None:
+            print("Could not extract camera index from filename:", vid_path)
+            continue
+        out_dir = os.path.join(args.output_root, vid_name)
+
+        stats = track_fused(args, vid_path, calib_path, out_dir)
+        fps = stats["frames"] / stats["total_s"] if stats["total_s"] > 0 else 0.0
+        print(f"Finished {vid_name} ({stats['frames']} frames, {fps:.2f} fps):")
+        print(f"  fused wall-clock : {stats['total_s']:.1f}s "
+              f"(map {stats['map_s']:.1f}s, tracking {stats['track_s']:.1f}s)")
+        if args.write_rectified:
+            print(f"  rectified video  : {stats['rectified_bytes'] / 1e6:.1f} MB (side output)")
+        elif stats["avoided_bytes"] is not None:
+            print(f"  disk avoided     : ~{stats['avoided_bytes'] / 1e6:.1f} MB of intermediate rectified "
+                  f"video, ~{stats['avoided_encode_s']:.1f}s of encoding "
+                  f"(mp4v, scaled from {stats['sampled_frames']} frames)")
+
+        if args.compare:
+            old = track_two_pass(args, vid_path, calib_path)
+            saved_disk = old["rectified_bytes"] - stats["rectified_bytes"]
+            print(f"  two-pass wall-clock: {old['total_s']:.1f}s "
+                  f"-> saved {old['total_s'] - stats['total_s']:.1f}s")
+            print(f"  disk saved       : {saved_disk / 1e6:.1f} MB of intermediate rectified video")
+        print(f"  Labels -> {os.path.join(out_dir, 'labels')}")
+
+
+if __name__ == "__main__":
+    main()
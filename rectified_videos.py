@@ -1,20 +1,34 @@
 import cv2
-import numpy as np
-import json
 import os
 import glob
 import re
+import argparse
 
-def load_calibration(calib_path):
-    # Load the camera calibration parameters from a JSON file.
-    with open(calib_path, 'r') as f:
-        calib = json.load(f)
-    mtx = np.array(calib["mtx"], dtype=np.float32)
-    dist = np.array(calib["dist"], dtype=np.float32)
-    return mtx, dist
+from camera_model import load_camera
+
+def calib_path_for_video(video_path, calib_root="calib-camera"):
+    # videos/out13.mp4 -> calib-camera/cam_13/camera_calib_real.json
+    match = re.search(r'out(\d+)\.mp4', os.path.basename(video_path))
+    if not match:
+        return None
+    return os.path.join(calib_root, f"cam_{match.group(1)}", "camera_calib_real.json")
+
+def rectified_frames(cap, map_x, map_y, writer=None):
+    """
+    Yield undistorted frames from an open capture, optionally also writing
+    them to a cv2.VideoWriter.
+    """
+    while True:
+        ret, frame = cap.read()
+        if not ret:
+            break
+        # Apply the undistortion map to the frame
+        rectified_frame = cv2.remap(frame, map_x, map_y, interpolation=cv2.INTER_LINEAR)
+        if writer is not None:
+            writer.write(rectified_frame)
+        yield rectified_frame
 
 def process_video(video_path, calib_path, output_path):
-    mtx, dist = load_calibration(calib_path)
     cap = cv2.VideoCapture(video_path)
     if not cap.isOpened():
         print("Error opening video file:", video_path)
@@ -28,25 +42,10 @@ def process_video(video_path, calib_path, output_path):
     fourcc = cv2.VideoWriter_fourcc(*'mp4v')
     out = cv2.VideoWriter(output_path, fourcc, fps, (width, height))
     
-
-    grid_x, grid_y = np.meshgrid(np.arange(width), np.arange(height))
-    pts = np.stack([grid_x, grid_y], axis=-1).astype(np.float32)
-    pts = pts.reshape(-1, 1, 2)
-    
-
-    undistorted_pts = cv2.undistortPoints(pts, mtx, dist, P=mtx)
-    undistorted_map = undistorted_pts.reshape(height, width, 2)
-    map_x = undistorted_map[:, :, 0]
-    map_y = undistorted_map[:, :, 1]
+    map_x, map_y = load_camera(calib_path).undistort_map(width, height)
     
     frame_count = 0
-    while True:
-        ret, frame = cap.read()
-        if not ret:
-            break
-        # Apply the undistortion map to the frame
-        rectified_frame = cv2.remap(frame, map_x, map_y, interpolation=cv2.INTER_LINEAR)
-        out.write(rectified_frame)
+    for _ in rectified_frames(cap, map_x, map_y, writer=out):
         frame_count += 1
         if frame_count % 50 == 0:
             print(f"Processed {frame_count} frames for {video_path}")
@@ -55,21 +54,23 @@ def process_video(video_path, calib_path, output_path):
     out.release()
     print(f"Finished processing video: {video_path}")
 
-def main():
-    video_files = glob.glob("videos/out*.mp4") # path to the video files
-    output_dir = "videos_rectified" # folder path where to save the rectified videos
+def main(argv=None):
+    p = argparse.ArgumentParser(description="Undistort videos/outNN.mp4 with their camera calibration")
+    p.add_argument("--videos", default="videos/out*.mp4", help="glob of the video files")
+    p.add_argument("--output_dir", default="videos_rectified",
+                   help="folder path where to save the rectified videos")
+    args = p.parse_args(argv)
+
+    video_files = glob.glob(args.videos)
+    output_dir = args.output_dir
     if not os.path.exists(output_dir):
         os.makedirs(output_dir)
     
     for video_path in video_files:
         
         basename = os.path.basename(video_path)
-        match = re.search(r'out(\d+)\.mp4', basename)
-        if match:
-            cam_index = match.group(1)
-            
-            calib_path = os.path.join("calib-camera", f"cam_{cam_index}", "camera_calib_real.json")
-        else:
+        calib_path = calib_path_for_video(video_path)
+        if calib_path is None:
             print("Could not extract camera index from filename:", video_path)
             continue
         
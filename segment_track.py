@@ -0,0 +1,228 @@
+#!/usr/bin/env python3
+"""
+Segment-parallel tracking of one long video.
+
+The video is cut into time segments that overlap by a few frames, every
+segment is tracked in its own worker process, and track IDs are stitched
+across each boundary by matching boxes inside the overlap window. The
+result is written as one continuous set of per-frame labels (track.py
+format) plus one CSV (interference.py format).
+"""
+import os, csv, time, argparse
+from concurrent.futures import ProcessPoolExecutor
+import multiprocessing as mp
+
+import cv2
+import numpy as np
+import motmetrics as mm
+from scipy.optimize import linear_sum_assignment
+
+from box_utils import box_iou
+from online_eval import OnlineEvaluator
+from labels import label_path, write_labels
+
+# ─── CONFIG ──────────────────────────────────────────────────────────────
+MODEL_PATH     = "runs/detect/train/weights/best.pt"
+VIDEO_SRC      = "videos/out13.mp4"
+OUTPUT_ROOT    = "result/2DTracking_segmented"
+TRACKER_CONFIG = "bytetrack.yaml"
+CONF_THRESHOLD = 0.25
+IOU_THRESHOLD  = 0.45
+IMG_SIZE       = 640
+OVERLAP        = 50      # frames shared by neighbouring segments
+MIN_STITCH_IOU = 0.5     # mean IoU over the overlap to join two IDs
+# ────────────────────────────────────────────────────────────────────────
+
+# rows everywhere below: [frame, id, x1, y1, x2, y2, conf, cls]
+
+def track_segment(model_path, video, start, end, tracker_cfg,
+                  conf=CONF_THRESHOLD, iou=IOU_THRESHOLD, imgsz=IMG_SIZE):
+    """Worker: track frames [start, end) of a video; returns the rows array."""
+    from ultralytics import YOLO
+    from id_tracker import IdentityTracker, stream_tracks
+
+    model = YOLO(model_path)
+    # one IdentityTracker for the whole segment; persist=True does the same for model.track
+    tracker = IdentityTracker(num_classes=len(model.names)) if tracker_cfg == "identity" else tracker_cfg
+
+    cap = cv2.VideoCapture(video)
+    cap.set(cv2.CAP_PROP_POS_FRAMES, start)
+    rows = []
+    for frame_idx in range(start, end):
+        ok, frame = cap.read()
+        if not ok:
+            break
+        result = next(stream_tracks(model, frame, tracker, conf=conf, iou=iou, imgsz=imgsz,
+                                    persist=True, verbose=False))
+        boxes = result.boxes
+        if boxes is None or len(boxes) == 0:
+            continue
+        boxes = boxes.cpu().numpy()
+        ids = boxes.id if boxes.id is not None else -np.ones(len(boxes))
+        rows.append(np.column_stack([np.full(len(boxes), frame_idx), ids, boxes.xyxy,
+                                     boxes.conf, boxes.cls]))
+    cap.release()
+    return np.concatenate(rows) if rows else np.zeros((0, 8))
+
+def split(n_frames, n_segments, overlap):
+    """[(start, end)] covering [0, n_frames), each extended by `overlap` frames."""
+    bounds = np.linspace(0, n_frames, n_segments + 1).astype(int)
+    return [(int(s), int(min(e + overlap, n_frames))) for s, e in zip(bounds[:-1], bounds[1:])]
+
+def match_ids(prev, rows, lo, hi):
+    """
+    Map local IDs of `rows` to IDs of `prev` by Hungarian assignment on the
+    IoU of their boxes summed over frames [lo, hi) where both appear.
+    """
+    pa = prev[(prev[:, 0] >= lo) & (prev[:, 0] < hi) & (prev[:, 1] >= 0)]
+    pb = rows[(rows[:, 0] >= lo) & (rows[:, 0] < hi) & (rows[:, 1] >= 0)]
+    if not len(pa) or not len(pb):
+        return {}
+    a_ids, a_inv = np.unique(pa[:, 1].astype(int), return_inverse=True)
+    b_ids, b_inv = np.unique(pb[:, 1].astype(int), return_inverse=True)
+    score = np.zeros((len(a_ids), len(b_ids)))
+    count = np.zeros((len(a_ids), len(b_ids)))
+    for f in np.intersect1d(pa[:, 0], pb[:, 0]):
+        ma, mb = pa[:, 0] == f, pb[:, 0] == f
+        ia, ib = a_inv[ma], b_inv[mb]
+        np.add.at(score, (ia[:, None], ib[None, :]), box_iou(pa[ma, 2:6], pb[mb, 2:6]))
+        np.add.at(count, (ia[:, None], ib[None, :]), 1)
+    r, c = linear_sum_assignment(-score)
+    ok = score[r, c] / np.maximum(count[r, c], 1) >= MIN_STITCH_IOU
+    return dict(zip(b_ids[c[ok]], a_ids[r[ok]]))
+
+def stitch(segments, results):
+    """
+    Join per-segment rows into one sequence with global IDs. Across each
+    overlap window the later segment's IDs are matched to the earlier
+    one's; the earlier segment keeps the first half of the window and the
+    later one the rest.
+    """
+    out, prev, next_gid = [], None, 1
+    for k, ((start, _), rows) in enumerate(zip(segments, results)):
+        rows = rows.copy()
+        prev_end = segments[k - 1][1] if k else start
+        mapping = match_ids(prev, rows, start, prev_end) if prev is not None else {}
+
+        # untracked boxes keep -1; everything else gets a global ID
+        local = rows[:, 1].astype(int)
+        for lid in np.unique(local[local >= 0]):
+            if lid in mapping:
+                gid = mapping[lid]
+            else:
+                gid, next_gid = next_gid, next_gid + 1
+            rows[local == lid, 1] = gid
+
+        cut = start + (prev_end - start) // 2
+        if k:
+            out[-1] = out[-1][out[-1][:, 0] < cut]
+        out.append(rows[rows[:, 0] >= cut])
+        prev = rows
+    return np.concatenate(out) if out else np.zeros((0, 8))
+
+def run(model_path, video, workers, overlap, tracker_cfg, **det_args):
+    """det_args (conf, iou, imgsz) are passed on to every track_segment."""
+    cap = cv2.VideoCapture(video)
+    n_frames = int(cap.get(cv2.CAP_PROP_FRAME_COUNT))
+    cap.release()
+    segments = split(n_frames, workers, overlap if workers > 1 else 0)
+
+    t0 = time.perf_counter()
+    if workers == 1:
+        results = [track_segment(model_path, video, *segments[0], tracker_cfg, **det_args)]
+    else:
+        # spawn: each worker gets its own CUDA context / model
+        with ProcessPoolExecutor(workers, mp_context=mp.get_context("spawn")) as ex:
+            futures = [ex.submit(track_segment, model_path, video, s, e, tracker_cfg, **det_args)
+                       for s, e in segments]
+            results = [f.result() for f in futures]
+    rows = stitch(segments, results)
+    return rows, n_frames, time.perf_counter() - t0
+
+def by_frame(rows, n_frames):
+    """Sort rows by frame; rows of frame f are then rows[bounds[f]:bounds[f+1]]."""
+    rows = rows[np.argsort(rows[:, 0], kind="stable")]
+    return rows, np.searchsorted(rows[:, 0], np.arange(n_frames + 1))
+
+def write_outputs(rows, n_frames, out_dir, vid_name):
+    label_dir = os.path.join(out_dir, "labels")
+    os.makedirs(label_dir, exist_ok=True)
+    rows, bounds = by_frame(rows, n_frames)
+    for f in range(n_frames):
+        # reorder to the label rows [x1,y1,x2,y2,id,conf,cls]
+        write_labels(label_path(label_dir, f), rows[bounds[f]:bounds[f + 1], [2, 3, 4, 5, 1, 6, 7]])
+    out_csv = os.path.join(out_dir, f"tracks_{vid_name}.csv")
+    with open(out_csv, "w", newline="") as csvf:
+        writer = csv.writer(csvf)
+        writer.writerow(["frame","id","x1","y1","x2","y2","score"])
+        for frame, tid, x1, y1, x2, y2, conf, _ in rows:
+            writer.writerow([int(frame), int(tid), x1, y1, x2, y2, conf])
+    return label_dir, out_csv
+
+def idf1_against(ref_rows, rows, n_frames):
+    """IDF1 of `rows` using another run (e.g. the sequential one) as reference."""
+    ref_rows, rb = by_frame(ref_rows, n_frames)
+    rows, tb = by_frame(rows, n_frames)
+    acc = mm.MOTAccumulator(auto_id=True)
+    for f in range(n_frames):
+        g, t = ref_rows[rb[f]:rb[f + 1]], rows[tb[f]:tb[f + 1]]
+        if not len(g) and not len(t):
+            continue
+        d = 1.0 - box_iou(g[:, 2:6], t[:, 2:6]) if len(g) and len(t) else np.empty((len(g), len(t)))
+        acc.update(g[:, 1].astype(int), t[:, 1].astype(int), np.where(d > 0.5, np.nan, d))
+    return float(mm.metrics.create().compute(acc, metrics=['idf1'])['idf1'].iloc[0])
+
+def idf1_gt(gt_path, rows, n_frames):
+    ev = OnlineEvaluator(gt_path)
+    rows, bounds = by_frame(rows, n_frames)
+    for f in range(n_frames):
+        r = rows[bounds[f]:bounds[f + 1]]
+        ev.update(f, r[:, 2:6], r[:, 1])
+    return ev.summary()['IDF1']
+
+def main(argv=None):
+    p = argparse.ArgumentParser()
+    p.add_argument("--video",   default=VIDEO_SRC)
+    p.add_argument("--model",   default=MODEL_PATH)
+    p.add_argument("--conf",    type=float, default=CONF_THRESHOLD)
+    p.add_argument("--iou",     type=float, default=IOU_THRESHOLD)
+    p.add_argument("--imgsz",   type=int, default=IMG_SIZE)
+    p.add_argument("--workers", type=int, nargs="+", default=[os.cpu_count() or 1],
+                   help="worker count; several values report scaling, the last one is written")
+    p.add_argument("--overlap", type=int, default=OVERLAP)
+    p.add_argument("--tracker", default=TRACKER_CONFIG,
+                   help="Ultralytics tracker yaml, or 'identity'")
+    p.add_argument("--output_root", default=OUTPUT_ROOT)
+    p.add_argument("--compare", action="store_true",
+                   help="also run the sequential tracker; report speedup and IDF1 delta")
+    p.add_argument("--gt", default=None, help="gt.txt for IDF1 against ground truth")
+    args = p.parse_args(argv)
+
+    vid_name = os.path.splitext(os.path.basename(args.video))[0]
+    det_args = dict(conf=args.conf, iou=args.iou, imgsz=args.imgsz)
+
+    if args.compare:
+        seq_rows, n_frames, seq_dt = run(args.model, args.video, 1, 0, args.tracker, **det_args)
+        seq_idf1 = idf1_gt(args.gt, seq_rows, n_frames) if args.gt else None
+        print(f"Sequential run: {n_frames} frames in {seq_dt:.1f}s"
+              + (f", IDF1 vs GT {seq_idf1:.3f}" if args.gt else ""))
+
+    for workers in args.workers:
+        rows, n_frames, dt = run(args.model, args.video, workers, args.overlap, args.tracker, **det_args)
+        print(f"Tracked {n_frames} frames with {workers} workers in {dt:.1f}s "
+              f"({len(np.unique(rows[rows[:, 1] >= 0, 1]))} IDs)")
+        par_idf1 = idf1_gt(args.gt, rows, n_frames) if args.gt else None
+        if args.compare:
+            print(f"  speedup {seq_dt / dt:.2f}× vs sequential; "
+                  f"IDF1 vs sequential tracks {idf1_against(seq_rows, rows, n_frames):.3f}")
+            if args.gt:
+                print(f"  IDF1 vs GT {par_idf1:.3f} (delta {par_idf1 - seq_idf1:+.3f})")
+        elif args.gt:
+            print(f"  IDF1 vs GT {par_idf1:.3f}")
+
+    label_dir, out_csv = write_outputs(rows, n_frames, os.path.join(args.output_root, vid_name), vid_name)
+    print(f"  Labels -> {label_dir}")
+    print(f"  CSV    -> {out_csv}")
+
+if __name__ == "__main__":
+    main()
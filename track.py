@@ -1,24 +1,77 @@
 import os
+import time
+import argparse
 import cv2
-from ultralytics import YOLO
+from id_tracker import stream_tracks
+from online_eval import OnlineEvaluator
+from detection_cache import load_or_detect, make_tracker, replay
+from labels import label_path, boxes_to_rows, write_labels
 
-# === Configuration ===
+# === Configuration (defaults; override on the command line or via cvtrack) ===
 MODEL_PATH     = "runs/detect/train/weights/best.pt"
 VIDEO_SRCS     = ["videos/out13.mp4"]
 OUTPUT_ROOT    = "result/2DTracking"
 TRACKER_CONFIG = "bytetrack.yaml"
 CONF_THRESHOLD = 0.25
 IOU_THRESHOLD  = 0.45
+IMG_SIZE       = 640
 
-model = YOLO(MODEL_PATH)
+def build_parser():
+    parser = argparse.ArgumentParser(description="Track videos, write annotated video + per-frame labels")
+    parser.add_argument("--videos", nargs="+", default=VIDEO_SRCS)
+    parser.add_argument("--model", default=MODEL_PATH)
+    parser.add_argument("--conf", type=float, default=CONF_THRESHOLD)
+    parser.add_argument("--iou", type=float, default=IOU_THRESHOLD)
+    parser.add_argument("--imgsz", type=int, default=IMG_SIZE)
+    parser.add_argument("--tracker", default=TRACKER_CONFIG,
+                        help="Ultralytics tracker yaml, or 'identity' for id_tracker.IdentityTracker")
+    parser.add_argument("--output_root", default=OUTPUT_ROOT,
+                        help="keep runs of different trackers apart for evaluate.py")
+    parser.add_argument("--gt", default=None,
+                        help="MOTChallenge gt.txt to evaluate against while tracking (as in evaluate.py)")
+    parser.add_argument("--eval_every", type=int, default=10,
+                        help="print running MOTA/IDF1 every N annotated frames")
+    parser.add_argument("--abort_mota", type=float, default=None,
+                        help="stop the run if running MOTA drops below this")
+    parser.add_argument("--abort_after", type=int, default=20,
+                        help="annotated frames to see before --abort_mota applies")
+    parser.add_argument("--det_cache", default=None, metavar="DIR",
+                        help="replay cached detections from DIR (filled on first run); labels only, no video")
+    return parser
 
-for vid_path in VIDEO_SRCS:
+
+def track_from_cache(args, vid_path, out_label_dir, evaluator):
+    """Tracker-only run over cached detections; writes the same labels as a live run."""
+    dets = load_or_detect(args.model, vid_path, args.conf, args.iou, args.imgsz, args.det_cache)
+    tracker = make_tracker(args.tracker, num_classes=len(dets.names))
+    frame_idx = -1
+    t_start = time.perf_counter()
+    for frame_idx, rows in replay(dets, tracker):
+        write_labels(label_path(out_label_dir, frame_idx), rows)
+        if evaluator is not None and evaluator.update(frame_idx, rows[:, :4], rows[:, 4]) \
+                and evaluator.n_frames % args.eval_every == 0:
+            evaluator.report(frame_idx)
+            if evaluator.should_abort(args.abort_mota, args.abort_after):
+                print(f"  Aborting: MOTA below {args.abort_mota}")
+                break
+    t_total = time.perf_counter() - t_start
+    print(f"Replayed {len(dets)} frames through {args.tracker} in {t_total:.2f}s")
+    if evaluator is not None:
+        evaluator.report(frame_idx)
+
+
+def track_video(args, model, vid_path):
     vid_name      = os.path.splitext(os.path.basename(vid_path))[0]
-    out_dir       = os.path.join(OUTPUT_ROOT, vid_name)
+    out_dir       = os.path.join(args.output_root, vid_name)
     out_video     = os.path.join(out_dir, f"{vid_name}_annotated.mp4")
     out_label_dir = os.path.join(out_dir, "labels")
     os.makedirs(out_label_dir, exist_ok=True)
 
+    if args.det_cache:
+        track_from_cache(args, vid_path, out_label_dir, OnlineEvaluator(args.gt) if args.gt else None)
+        print(f"  Labels -> {out_label_dir}")
+        return
+
     # Video writer setup
     cap = cv2.VideoCapture(vid_path)
     fps = cap.get(cv2.CAP_PROP_FPS)
@@ -28,36 +81,57 @@ for vid_path in VIDEO_SRCS:
     writer = cv2.VideoWriter(out_video, cv2.VideoWriter_fourcc(*"mp4v"), fps, (w, h))
 
     # Stream tracking
-    stream = model.track(
-        source=vid_path,
-        tracker=TRACKER_CONFIG,
-        conf=CONF_THRESHOLD,
-        iou=IOU_THRESHOLD,
-        stream=True,
-        save=False
-    )
+    stats = {}
+    stream = stream_tracks(model, vid_path, args.tracker, stats,
+                           conf=args.conf, iou=args.iou, imgsz=args.imgsz)
+
+    evaluator = OnlineEvaluator(args.gt) if args.gt else None
 
+    n_frames = 0
+    frame_idx = -1
+    t_start = time.perf_counter()
     for frame_idx, result in enumerate(stream):
+        n_frames += 1
+
         # Annotate and write frame
         annotated = result.plot()
         writer.write(annotated)
 
-        # Dump boxes safely
-        boxes = result.boxes
-        # Determine how many detections we actually have
-        num_boxes = len(boxes.xyxy) if (boxes is not None and boxes.xyxy is not None) else 0
-
-        txt_path = os.path.join(out_label_dir, f"{frame_idx:06d}.txt")
-        with open(txt_path, "w") as f:
-            for i in range(num_boxes):
-                cls  = int(boxes.cls[i])
-                conf = float(boxes.conf[i])
-                x1, y1, x2, y2 = boxes.xyxy[i].tolist()
-                # If tracker failed to assign an ID, boxes.id may be None
-                tid = int(boxes.id[i]) if (hasattr(boxes, "id") and boxes.id is not None) else -1
-                f.write(f"{cls} {x1:.1f} {y1:.1f} {x2:.1f} {y2:.1f} {tid} {conf:.3f}\n")
+        # Dump boxes (track id -1 if the tracker assigned none)
+        rows = boxes_to_rows(result.boxes)
+        write_labels(label_path(out_label_dir, frame_idx), rows)
+
+        # Online evaluation on the annotated frame stride
+        if evaluator is not None:
+            if evaluator.update(frame_idx, rows[:, :4], rows[:, 4]) and evaluator.n_frames % args.eval_every == 0:
+                evaluator.report(frame_idx)
+                if evaluator.should_abort(args.abort_mota, args.abort_after):
+                    print(f"  Aborting {vid_name}: MOTA below {args.abort_mota}")
+                    break
 
     writer.release()
+    t_total = time.perf_counter() - t_start
     print(f"Finished {vid_name}:")
+    if n_frames:
+        print(f"  {args.tracker}: {1000 * t_total / n_frames:.1f} ms/frame end-to-end"
+              + (f", {1000 * stats['tracker_s'] / n_frames:.2f} ms/frame in the tracker" if "tracker_s" in stats else ""))
+    if evaluator is not None:
+        evaluator.report(frame_idx)
     print(f"  Video -> {out_video}")
     print(f"  Labels -> {out_label_dir}")
+
+
+def main(argv=None):
+    args = build_parser().parse_args(argv)
+
+    # Detection replay doesn't need the model unless the cache misses
+    model = None
+    if not args.det_cache:
+        from ultralytics import YOLO
+        model = YOLO(args.model)
+
+    for vid_path in args.videos:
+        track_video(args, model, vid_path)
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,83 @@
+#!/usr/bin/env python3
+"""
+Tracker parameter sweep over cached detections.
+
+Runs inference once (or reuses detection_cache), then replays the cached
+detections through every combination of tracker settings and scores each
+one online against the GT, e.g.
+
+  python tracker_sweep.py --grid match_thresh=0.7,0.8,0.9 track_buffer=30,60
+"""
+import os, time, itertools, argparse
+import pandas as pd
+
+from detection_cache import load_or_detect, make_tracker, replay, CACHE_DIR
+from online_eval import OnlineEvaluator
+
+# ─── CONFIG ──────────────────────────────────────────────────────────────
+MODEL_PATH     = "runs/detect/train/weights/best.pt"
+VIDEO_SRC      = "videos/out13.mp4"
+GT_PATH        = "result/2DTracking/out13/evaluation/gt.txt"
+TRACKER_CONFIG = "bytetrack.yaml"
+CONF_THRESHOLD = 0.25
+IOU_THRESHOLD  = 0.45
+IMG_SIZE       = 640
+OUT_CSV        = "result/2DTracking/out13/evaluation/tracker_sweep.csv"
+# ────────────────────────────────────────────────────────────────────────
+
+def parse_value(v):
+    for cast in (int, float):
+        try:
+            return cast(v)
+        except ValueError:
+            pass
+    return v
+
+def parse_grid(items):
+    """['a=1,2', 'b=x'] -> [{'a':1,'b':'x'}, {'a':2,'b':'x'}]"""
+    keys, values = [], []
+    for item in items:
+        k, vs = item.split("=", 1)
+        keys.append(k)
+        values.append([parse_value(v) for v in vs.split(",")])
+    return [dict(zip(keys, combo)) for combo in itertools.product(*values)]
+
+def main(argv=None):
+    p = argparse.ArgumentParser()
+    p.add_argument("--video",   default=VIDEO_SRC)
+    p.add_argument("--model",   default=MODEL_PATH)
+    p.add_argument("--gt",      default=GT_PATH)
+    p.add_argument("--conf",    type=float, default=CONF_THRESHOLD)
+    p.add_argument("--iou",     type=float, default=IOU_THRESHOLD)
+    p.add_argument("--imgsz",   type=int, default=IMG_SIZE)
+    p.add_argument("--tracker", default=TRACKER_CONFIG,
+                   help="Ultralytics tracker yaml or 'identity'")
+    p.add_argument("--grid",    nargs="*", default=[],
+                   help="key=v1,v2,... tracker settings to sweep")
+    p.add_argument("--cache_dir", default=CACHE_DIR)
+    p.add_argument("--out_csv", default=OUT_CSV)
+    args = p.parse_args(argv)
+
+    dets = load_or_detect(args.model, args.video, args.conf, args.iou,
+                          args.imgsz, args.cache_dir)
+
+    rows = []
+    for overrides in parse_grid(args.grid):
+        tracker   = make_tracker(args.tracker, len(dets.names), overrides)
+        evaluator = OnlineEvaluator(args.gt)
+        t0 = time.perf_counter()
+        for frame_idx, tracks in replay(dets, tracker):
+            evaluator.update(frame_idx, tracks[:, :4], tracks[:, 4])
+        dt = time.perf_counter() - t0
+        s = evaluator.summary()
+        rows.append({**overrides, "MOTA": s["MOTA"], "IDF1": s["IDF1"],
+                     "mean_IoU": s["mean_IoU"], "replay_s": dt})
+        print(f"{overrides or 'defaults'}: MOTA {s['MOTA']:.3f}  IDF1 {s['IDF1']:.3f}  ({dt:.2f}s)")
+
+    table = pd.DataFrame(rows)
+    os.makedirs(os.path.dirname(args.out_csv) or ".", exist_ok=True)
+    table.to_csv(args.out_csv, index=False)
+    print(f"✅ wrote {len(table)} configurations → {args.out_csv}")
+
+if __name__ == "__main__":
+    main()
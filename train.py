@@ -1,4 +1,4 @@
-from ultralytics import YOLO
+import argparse
 
 # base model 
 base_model = "models/yolov8l.pt"
@@ -13,14 +13,32 @@ batch    = 16
 project  = "runs/detect"
 name     = "train"
 
-# Load the base model
-model = YOLO(base_model)
-
-model.train(
-    data=data_yaml,
-    epochs=epochs,
-    imgsz=img_size,
-    batch=batch,
-    project=project,
-    name=name
-)
+
+def main(argv=None):
+    p = argparse.ArgumentParser(description="Fine-tune YOLOv8 on the data.yaml dataset")
+    p.add_argument("--model",   default=base_model, help="base model")
+    p.add_argument("--data",    default=data_yaml)
+    p.add_argument("--epochs",  type=int, default=epochs)
+    p.add_argument("--imgsz",   type=int, default=img_size)
+    p.add_argument("--batch",   type=int, default=batch)
+    p.add_argument("--project", default=project)
+    p.add_argument("--name",    default=name)
+    args = p.parse_args(argv)
+
+    from ultralytics import YOLO
+
+    # Load the base model
+    model = YOLO(args.model)
+
+    model.train(
+        data=args.data,
+        epochs=args.epochs,
+        imgsz=args.imgsz,
+        batch=args.batch,
+        project=args.project,
+        name=args.name
+    )
+
+
+if __name__ == "__main__":
+    main()
@@ -27,7 +27,7 @@ def per_track_metrics(df, fps):
             "avg_speed_mps","max_speed_mps","avg_height_m"]
     return pd.DataFrame(rows, columns=cols)
 
-def main():
+def main(argv=None):
     p = argparse.ArgumentParser()
     p.add_argument("--in_csv",  default="result/world3d_court.csv",
                    help="court-aligned CSV (X_m,Y_m,Z_m,frame,id)")
@@ -35,7 +35,7 @@ def main():
                    help="video frame-rate (default 25)")
     p.add_argument("--out_csv", default="result/track_metrics.csv",
                    help="where to save the metrics table")
-    args = p.parse_args()
+    args = p.parse_args(argv)
 
     df = pd.read_csv(args.in_csv)
     needed = {"id","frame","X_m","Y_m","Z_m"}
@@ -0,0 +1,164 @@
+import os, argparse, time
+import numpy as np, pandas as pd
+
+def pick_xyz(df):
+    for triple in (("X_m","Y_m","Z_m"), ("X","Y","Z")):
+        if all(c in df.columns for c in triple):
+            return list(triple)
+    raise RuntimeError("no X/Y/Z columns found")
+
+def build_segments(df, cols, max_gap):
+    """
+    Split every track at gaps longer than max_gap frames. Returns, per row,
+    the segment index and the frame offset from that segment's start, plus
+    per-segment id, start frame and length.
+    """
+    df = (df.groupby(["id","frame"], as_index=False)[cols].mean()
+            .sort_values(["id","frame"], kind="stable"))
+    ids    = df.id.to_numpy()
+    frames = df.frame.to_numpy().astype(np.int64)
+
+    new_seg = np.ones(len(df), dtype=bool)
+    new_seg[1:] = (ids[1:] != ids[:-1]) | (np.diff(frames) > max_gap + 1)
+    seg = np.cumsum(new_seg) - 1
+    starts = np.flatnonzero(new_seg)
+
+    seg_id    = ids[starts]
+    seg_start = frames[starts]
+    offset    = frames - seg_start[seg]
+    seg_len   = np.zeros(len(starts), dtype=np.int64)
+    np.maximum.at(seg_len, seg, offset + 1)
+
+    return seg, offset, df[cols].to_numpy(dtype=float), seg_id, seg_start, seg_len
+
+def kalman_rts(Z, lengths, dt, meas_std, accel_std):
+    """
+    Constant-velocity Kalman filter + RTS smoother, batched over segments.
+    The three axes share the observation mask, so the 2×2 covariance is the
+    same for all of them and is kept once per segment.
+    Z is (S, L, 3) with NaN where unobserved; returns smoothed (pos, vel).
+    """
+    S, L, _ = Z.shape
+    obs = ~np.isnan(Z[..., 0])
+    R   = meas_std**2
+    q11 = accel_std**2 * dt**4 / 4
+    q12 = accel_std**2 * dt**3 / 2
+    q22 = accel_std**2 * dt**2
+
+    # filtered state per step (positions/velocities per axis, covariance shared)
+    pf = np.empty((S, L, 3)); vf = np.empty((S, L, 3))
+    af = np.empty((S, L));    bf = np.empty((S, L));    cf = np.empty((S, L))
+
+    # every segment starts on an observation
+    p = Z[:, 0].copy(); v = np.zeros((S, 3))
+    a = np.full(S, R);  b = np.zeros(S); c = np.full(S, R / dt**2)
+    pf[:, 0], vf[:, 0], af[:, 0], bf[:, 0], cf[:, 0] = p, v, a, b, c
+
+    for t in range(1, L):
+        # predict
+        p = p + dt * v
+        a, b, c = a + 2*dt*b + dt*dt*c + q11, b + dt*c + q12, c + q22
+        # update where observed
+        m  = obs[:, t]
+        k1 = np.where(m, a / (a + R), 0.0)
+        k2 = np.where(m, b / (a + R), 0.0)
+        y  = np.where(m[:, None], Z[:, t] - p, 0.0)
+        p  = p + k1[:, None] * y
+        v  = v + k2[:, None] * y
+        a, b, c = (1 - k1) * a, (1 - k1) * b, c - k2 * b
+        pf[:, t], vf[:, t], af[:, t], bf[:, t], cf[:, t] = p, v, a, b, c
+
+    # RTS backward pass (means only)
+    ps = pf.copy(); vs = vf.copy()
+    for t in range(L - 2, -1, -1):
+        a, b, c = af[:, t], bf[:, t], cf[:, t]
+        # one-step prediction from t
+        pp = pf[:, t] + dt * vf[:, t]
+        A, B, C = a + 2*dt*b + dt*dt*c + q11, b + dt*c + q12, c + q22
+        det = A*C - B*B
+        # G = P_f F^T P_pred^-1
+        g11 = ((a + dt*b) * C - b * B) / det
+        g12 = (b * A - (a + dt*b) * B) / det
+        g21 = ((b + dt*c) * C - c * B) / det
+        g22 = (c * A - (b + dt*c) * B) / det
+        dp = ps[:, t+1] - pp
+        dv = vs[:, t+1] - vf[:, t]
+        live = (t + 1 < lengths)[:, None]
+        ps[:, t] = np.where(live, pf[:, t] + g11[:, None]*dp + g12[:, None]*dv, pf[:, t])
+        vs[:, t] = np.where(live, vf[:, t] + g21[:, None]*dp + g22[:, None]*dv, vf[:, t])
+    return ps, vs
+
+def smooth_tracks(df, fps, max_gap, meas_std, accel_std, max_cells=20_000_000):
+    cols = pick_xyz(df)
+    seg, offset, xyz, seg_id, seg_start, seg_len = build_segments(df, cols, max_gap)
+    if not len(seg_len):
+        # e.g. no points landed inside the court
+        return pd.DataFrame(columns=["frame", "id", *cols, "vx", "vy", "vz", "observed"])
+    row_order = np.argsort(seg, kind="stable")
+    seg_rows  = np.searchsorted(seg[row_order], np.arange(len(seg_len) + 1))
+
+    # process segments of similar length together to keep the padding small;
+    # each chunk is laid out as a padded (S, L, 3) array, NaN where missing
+    order = np.argsort(seg_len, kind="stable")
+    out = []
+    i = 0
+    while i < len(order):
+        j = i + 1
+        while j < len(order) and (j - i + 1) * seg_len[order[j]] <= max_cells:
+            j += 1
+        sel = order[i:j]
+        L = seg_len[sel].max()
+        rows = np.concatenate([row_order[seg_rows[k]:seg_rows[k+1]] for k in sel])
+        local = np.empty(len(seg_len), dtype=np.int64)
+        local[sel] = np.arange(len(sel))
+        Z = np.full((len(sel), L, 3), np.nan)
+        Z[local[seg[rows]], offset[rows]] = xyz[rows]
+        pos, vel = kalman_rts(Z, seg_len[sel], 1.0 / fps, meas_std, accel_std)
+
+        s_idx, t_idx = np.nonzero(np.arange(L)[None, :] < seg_len[sel][:, None])
+        chunk = pd.DataFrame({
+            "frame": seg_start[sel][s_idx] + t_idx,
+            "id":    seg_id[sel][s_idx],
+        })
+        chunk[cols] = pos[s_idx, t_idx]
+        chunk[["vx","vy","vz"]] = vel[s_idx, t_idx]
+        chunk["observed"] = ~np.isnan(Z[s_idx, t_idx, 0])
+        out.append(chunk)
+        i = j
+
+    return pd.concat(out, ignore_index=True).sort_values(["id","frame"], ignore_index=True)
+
+def main(argv=None):
+    p = argparse.ArgumentParser()
+    p.add_argument("--in_csv",  default="result/world3d_court.csv",
+                   help="3-D tracks CSV (frame,id + X_m,Y_m,Z_m or X,Y,Z)")
+    p.add_argument("--out_csv", default="result/world3d_court_smooth.csv",
+                   help="where to save smoothed positions and velocities")
+    p.add_argument("--fps",     type=float, default=25,
+                   help="video frame-rate (default 25)")
+    p.add_argument("--max_gap", type=int, default=10,
+                   help="fill gaps up to this many frames; longer gaps split the track")
+    p.add_argument("--meas_std",  type=float, default=0.15,
+                   help="measurement noise std, in the CSV's position units")
+    p.add_argument("--accel_std", type=float, default=3.0,
+                   help="process noise (acceleration) std, position units / s²")
+    args = p.parse_args(argv)
+
+    df = pd.read_csv(args.in_csv)
+    if not {"id","frame"}.issubset(df.columns):
+        raise RuntimeError(f"{args.in_csv} needs 'id' and 'frame' columns")
+    cols = pick_xyz(df)
+    df = df.dropna(subset=cols)
+
+    t0 = time.perf_counter()
+    smooth = smooth_tracks(df, args.fps, args.max_gap, args.meas_std, args.accel_std)
+    dt = time.perf_counter() - t0
+
+    os.makedirs(os.path.dirname(args.out_csv) or ".", exist_ok=True)
+    smooth.to_csv(args.out_csv, index=False)
+    n_filled = int((~smooth.observed).sum())
+    print(f"✅  smoothed {smooth.id.nunique()} tracks, {len(smooth)} rows "
+          f"({n_filled} gap-filled) in {dt:.2f}s →", args.out_csv)
+
+if __name__ == "__main__":
+    main()
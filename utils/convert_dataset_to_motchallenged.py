@@ -1,5 +1,6 @@
 import os
 import glob
+import argparse
 import cv2
 import pandas as pd
 
@@ -12,12 +13,22 @@ ANNOT_FPS  = 5       # your exported annotation FPS
 MAX_FRAME  = 130     # number of annotated frames
 # ──────────────────────────────────────────────────────────────────────────────
 
-def main():
-    os.makedirs(os.path.dirname(OUT_GT), exist_ok=True)
-    factor = ORIG_FPS // ANNOT_FPS  # 25//5 = 5
+def main(argv=None):
+    p = argparse.ArgumentParser(description="Convert Roboflow YOLO labels of one video into MOTChallenge GT")
+    p.add_argument("--lbl_dir",   default=LBL_DIR)
+    p.add_argument("--img_dir",   default=IMG_DIR)
+    p.add_argument("--out_gt",    default=OUT_GT)
+    p.add_argument("--video",     default="out13", help="video prefix of the exported frames")
+    p.add_argument("--orig_fps",  type=int, default=ORIG_FPS)
+    p.add_argument("--annot_fps", type=int, default=ANNOT_FPS)
+    p.add_argument("--max_frame", type=int, default=MAX_FRAME)
+    args = p.parse_args(argv)
+
+    os.makedirs(os.path.dirname(args.out_gt), exist_ok=True)
+    factor = args.orig_fps // args.annot_fps  # 25//5 = 5
 
     rows = []
-    label_paths = sorted(glob.glob(os.path.join(LBL_DIR, "out13_frame_*_png.rf.*.txt")))
+    label_paths = sorted(glob.glob(os.path.join(args.lbl_dir, f"{args.video}_frame_*_png.rf.*.txt")))
     print(f"Found {len(label_paths)} label files")
 
     for lbl in label_paths:
@@ -29,14 +40,14 @@ def main():
             print("Skipping unrecognized file:", fname)
             continue
 
-        if not (1 <= frame0 <= MAX_FRAME):
+        if not (1 <= frame0 <= args.max_frame):
             continue
 
         # Map to original-frame numbering
         orig_frame = (frame0 - 1) * factor + 1
 
         # Find the matching image (handles the hash in the name)
-        pattern = os.path.join(IMG_DIR, f"out13_frame_{parts[2]}_*.jpg")
+        pattern = os.path.join(args.img_dir, f"{args.video}_frame_{parts[2]}_*.jpg")
         imgs = glob.glob(pattern)
         if not imgs:
             raise FileNotFoundError(f"No image for annotated frame {frame0} (looked for {pattern})")
@@ -70,8 +81,8 @@ def main():
 
     # Write MOTChallenge GT
     gt = pd.DataFrame(rows, columns=["frame","id","x","y","w","h"])
-    gt.to_csv(OUT_GT, index=False, header=False, float_format="%.3f")
-    print(f"Wrote {len(gt)} boxes over {gt.frame.nunique()} frames to {OUT_GT}")
+    gt.to_csv(args.out_gt, index=False, header=False, float_format="%.3f")
+    print(f"Wrote {len(gt)} boxes over {gt.frame.nunique()} frames to {args.out_gt}")
 
 if __name__ == "__main__":
     main()
@@ -1,4 +1,4 @@
-import os, glob, pandas as pd
+import os, glob, argparse, pandas as pd
 
 def convert_track_to_mot(
     txt_folder:str,
@@ -47,10 +47,20 @@ def convert_track_to_mot(
     print(f"Wrote {len(df)} detections across {df['frame'].nunique()} frames to {out_path}")
 
 
-if __name__ == "__main__":
+def main(argv=None):
+    p = argparse.ArgumentParser()
+    p.add_argument("--txt_folder", default="result/2DTracking/out13/labels")
+    p.add_argument("--out_path",   default="result/2DTracking/out13/evaluation/track.txt")
+    p.add_argument("--orig_fps",   type=int, default=25)
+    p.add_argument("--tgt_fps",    type=int, default=5)
+    args = p.parse_args(argv)
     convert_track_to_mot(
-      txt_folder="result/2DTracking/out13/labels",
-      out_path  ="result/2DTracking/out13/evaluation/track.txt",
-      orig_fps=25,
-      tgt_fps=5
+      txt_folder=args.txt_folder,
+      out_path  =args.out_path,
+      orig_fps=args.orig_fps,
+      tgt_fps=args.tgt_fps
     )
+
+
+if __name__ == "__main__":
+    main()
@@ -1,7 +1,5 @@
 import os, argparse, sys
-import numpy as np, pandas as pd, matplotlib.pyplot as plt
-from sklearn.decomposition import PCA
-from mpl_toolkits.mplot3d import Axes3D  # noqa: F401
+import numpy as np, pandas as pd
 
 # court dimensions
 COURT_X, COURT_Y, COURT_Z = 28.0, 15.0, 3.0
@@ -18,6 +16,7 @@ def maybe_mm_to_m(arr):
     return arr/1000.0 if np.median(np.abs(arr)) > 50 else arr
 
 def floor_align(XYZ):
+    from sklearn.decomposition import PCA
     pca = PCA(3).fit(XYZ)
     n   = pca.components_[2]
     c   = XYZ.mean(axis=0)
@@ -30,17 +29,19 @@ def floor_align(XYZ):
 def robust_span(v):
     return np.percentile(v,95) - np.percentile(v,5)
 
-def main():
-    IN_CSV="result/world3d.csv"
-    OUT_DIR="result"
-   
-    if not os.path.exists(IN_CSV):
-        sys.exit(f"{IN_CSV} not found")
+def main(argv=None):
+    p = argparse.ArgumentParser(description="Floor-align and scale triangulated points onto the court")
+    p.add_argument("--in_csv",  default="result/world3d.csv")
+    p.add_argument("--out_dir", default="result")
+    args = p.parse_args(argv)
 
-    os.makedirs(OUT_DIR, exist_ok=True)
+    if not os.path.exists(args.in_csv):
+        sys.exit(f"{args.in_csv} not found")
+
+    os.makedirs(args.out_dir, exist_ok=True)
 
     # load
-    df = pd.read_csv(IN_CSV)
+    df = pd.read_csv(args.in_csv)
     Xc,Yc,Zc = pick_xyz(df)
     for c in (Xc,Yc,Zc):
         df[c] = pd.to_numeric(df[c], errors="coerce")
@@ -74,12 +75,14 @@ def main():
     print(f"kept {len(court)} / {len(df)} points inside court")
 
     # write CSV
-    csv_out = os.path.join(OUT_DIR, "world3d_court.csv")
+    csv_out = os.path.join(args.out_dir, "world3d_court.csv")
     court.to_csv(csv_out, index=False)
     print("✅  wrote", csv_out)
 
     # plot
-    png_out = os.path.join(OUT_DIR, "world3d_court.png")
+    import matplotlib.pyplot as plt
+    from mpl_toolkits.mplot3d import Axes3D  # noqa: F401
+    png_out = os.path.join(args.out_dir, "world3d_court.png")
     fig = plt.figure(figsize=(9,7))
     ax  = fig.add_subplot(111, projection="3d")
     ids = court.get("id", pd.Series(0))